@@ -1,15 +1,16 @@
-import os, sys
-from pathlib import Path
+import os
+import sys
 from logging.config import fileConfig
+from pathlib import Path
 
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
+from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 
 # Add the parent directory to the Python path to make imports work
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from migration_helpers import PROGRESS_TABLE
 # Import your models here to ensure Alembic detects them
 from models.schema import Base
 
@@ -20,9 +21,19 @@ config = context.config
 # Interpret the config file for Python logging.
 fileConfig(config.config_file_name)
 
+# Let DATABASE_URL point migrations at the same database as the app
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Backfill bookkeeping lives outside the models; keep autogenerate from dropping it
+    if type_ == "table" and name == PROGRESS_TABLE:
+        return False
+    return True
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -31,6 +42,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -50,6 +62,7 @@ def run_migrations_online():
             connection=connection, 
             target_metadata=target_metadata,
             render_as_batch=True,  # Important for SQLite
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -7,9 +7,9 @@ Create Date: 2025-05-11 21:28:40.833477
 """
 from typing import Sequence, Union
 
-from alembic import op
 import sqlalchemy as sa
 
+from alembic import op
 
 # revision identifiers, used by Alembic.
 revision: str = 'c66b6ea45d9f'
@@ -5,14 +5,16 @@ Revises: c66b6ea45d9f
 Create Date: 2025-05-11 21:32:57.081669
 
 """
+import json
+import uuid
+from datetime import datetime
 from typing import Sequence, Union
 
-from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import table, column, String, DateTime, Text, Integer, Float, Boolean
-from datetime import datetime
-import uuid
-import json
+from sqlalchemy import (Boolean, DateTime, Float, Integer, String, Text,
+                        column, table)
+
+from alembic import op
 
 # revision identifiers, used by Alembic.
 revision: str = 'b4612156f1d5'
@@ -0,0 +1,61 @@
+"""add turn counters to debates
+
+Revision ID: bb7a044500f0
+Revises: b4612156f1d5
+Create Date: 2026-10-19 09:30:12.418204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'bb7a044500f0'
+down_revision: Union[str, None] = 'b4612156f1d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_turn_number', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('current_phase', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('phase_turn_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_side', sa.String(), nullable=True))
+
+    # Seed the counters of existing debates from their latest turn
+    op.execute("""
+        UPDATE debates SET
+            next_turn_number = COALESCE(
+                (SELECT MAX(t.turn_number) FROM debate_turns t WHERE t.debate_id = debates.debate_id), 0
+            ) + 1,
+            current_phase = (
+                SELECT t.phase FROM debate_turns t WHERE t.debate_id = debates.debate_id
+                ORDER BY t.turn_number DESC LIMIT 1
+            ),
+            last_side = (
+                SELECT p.side FROM debate_turns t
+                JOIN debate_participants p ON p.participant_id = t.participant_id
+                WHERE t.debate_id = debates.debate_id
+                ORDER BY t.turn_number DESC LIMIT 1
+            )
+    """)
+    op.execute("""
+        UPDATE debates SET phase_turn_count = (
+            SELECT COUNT(*) FROM debate_turns t
+            WHERE t.debate_id = debates.debate_id AND t.phase = debates.current_phase
+        )
+        WHERE current_phase IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.drop_column('last_side')
+        batch_op.drop_column('phase_turn_count')
+        batch_op.drop_column('current_phase')
+        batch_op.drop_column('next_turn_number')
@@ -0,0 +1,40 @@
+"""add debate and phase deadlines
+
+Revision ID: 55a373fca83e
+Revises: 487c43d319dd
+Create Date: 2026-10-19 11:02:31.559816
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '55a373fca83e'
+down_revision: Union[str, None] = '487c43d319dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('debate_format_phases', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('time_limit_minutes', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('started_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('phase_started_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_debates_status'), ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_debates_status'))
+        batch_op.drop_column('phase_started_at')
+        batch_op.drop_column('started_at')
+
+    with op.batch_alter_table('debate_format_phases', schema=None) as batch_op:
+        batch_op.drop_column('time_limit_minutes')
@@ -0,0 +1,74 @@
+"""add usage rollups
+
+Revision ID: 14f9e4041f18
+Revises: 55a373fca83e
+Create Date: 2026-10-19 11:48:05.274930
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '14f9e4041f18'
+down_revision: Union[str, None] = '55a373fca83e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('model_pricing',
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('usd_per_1k_tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('model')
+    )
+    op.create_table('usage_by_day',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('llm_config_id', sa.String(), nullable=False),
+    sa.Column('turns', sa.Integer(), nullable=False),
+    sa.Column('tokens_used', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['llm_config_id'], ['llm_configs.config_id'], ),
+    sa.PrimaryKeyConstraint('day', 'llm_config_id')
+    )
+    op.create_table('usage_by_debate',
+    sa.Column('debate_id', sa.String(), nullable=False),
+    sa.Column('llm_config_id', sa.String(), nullable=False),
+    sa.Column('turns', sa.Integer(), nullable=False),
+    sa.Column('tokens_used', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['debate_id'], ['debates.debate_id'], ),
+    sa.ForeignKeyConstraint(['llm_config_id'], ['llm_configs.config_id'], ),
+    sa.PrimaryKeyConstraint('debate_id', 'llm_config_id')
+    )
+
+    # Roll up the turns recorded so far
+    op.execute("""
+        INSERT INTO usage_by_debate (debate_id, llm_config_id, turns, tokens_used, updated_at)
+        SELECT t.debate_id, u.llm_config_id, COUNT(*), COALESCE(SUM(t.tokens_used), 0), CURRENT_TIMESTAMP
+        FROM debate_turns t
+        JOIN debate_participants p ON p.participant_id = t.participant_id
+        JOIN users u ON u.user_id = p.user_id
+        WHERE u.llm_config_id IS NOT NULL
+        GROUP BY t.debate_id, u.llm_config_id
+    """)
+    op.execute("""
+        INSERT INTO usage_by_day (day, llm_config_id, turns, tokens_used, updated_at)
+        SELECT date(t.timestamp), u.llm_config_id, COUNT(*), COALESCE(SUM(t.tokens_used), 0), CURRENT_TIMESTAMP
+        FROM debate_turns t
+        JOIN debate_participants p ON p.participant_id = t.participant_id
+        JOIN users u ON u.user_id = p.user_id
+        WHERE u.llm_config_id IS NOT NULL
+        GROUP BY date(t.timestamp), u.llm_config_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('usage_by_debate')
+    op.drop_table('usage_by_day')
+    op.drop_table('model_pricing')
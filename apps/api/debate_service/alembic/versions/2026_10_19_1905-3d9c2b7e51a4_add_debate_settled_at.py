@@ -0,0 +1,33 @@
+"""add debate settled_at
+
+Revision ID: 3d9c2b7e51a4
+Revises: 14f9e4041f18
+Create Date: 2026-10-19 19:05:12.403118
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9c2b7e51a4'
+down_revision: Union[str, None] = '14f9e4041f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('settled_at', sa.DateTime(), nullable=True))
+
+    # Debates completed before this revision have no post-turn work left
+    op.execute("UPDATE debates SET settled_at = completed_at WHERE status = 'completed'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('debates', schema=None) as batch_op:
+        batch_op.drop_column('settled_at')
@@ -1,13 +1,53 @@
-from sqlalchemy import create_engine
+import os
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+# DEBATE_STORAGE=memory keeps the whole database in a shared-cache in-memory
+# SQLite for simulation sweeps and tests: no file I/O, no fsyncs, gone when
+# the process exits (unless snapshotted). A module-level keeper connection
+# holds it alive. The engine's pool has exactly one connection, so sessions
+# in different threads take turns with it instead of sharing one
+# transaction; a session waits for the previous one to commit or close.
+STORAGE_MODE = os.getenv("DEBATE_STORAGE", "file")
+IN_MEMORY = STORAGE_MODE == "memory"
+MEMORY_DATABASE_URI = "file:masterdebater?mode=memory&cache=shared"
+MEMORY_DATABASE_URL = f"sqlite:///{MEMORY_DATABASE_URI}&uri=true"
 
 # SQLite database file relative to project root
-DATABASE_URL = "sqlite:///db/masterdebater.db"
+DATABASE_URL = MEMORY_DATABASE_URL if IN_MEMORY else os.getenv("DATABASE_URL", "sqlite:///db/masterdebater.db")
 
 # Required for SQLite multithreading in FastAPI
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+if IN_MEMORY:
+    _keeper = sqlite3.connect(MEMORY_DATABASE_URI, uri=True, check_same_thread=False)
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=60,
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL, connect_args={"check_same_thread": False}
+    )
+
+
+def set_sqlite_pragmas(dbapi_connection, _):
+    # WAL lets readers run alongside the single writer; busy_timeout makes a
+    # blocked writer wait for the lock instead of failing immediately.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+if not IN_MEMORY:
+    event.listen(engine, "connect", set_sqlite_pragmas)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -19,3 +59,36 @@ def get_session():
         yield db
     finally:
         db.close()
+
+SEED_REVISION = "b4612156f1d5"
+
+def init_memory_database():
+    """Create the schema from the models and load the reference seed data.
+
+    The seed comes from running migration b4612156f1d5's upgrade() directly,
+    so it cannot drift from what `alembic upgrade head` produces. The
+    database is stamped at head so a snapshot can take later migrations.
+    """
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from alembic.script import ScriptDirectory
+    from debate_service.models.schema import Base
+
+    scripts = ScriptDirectory(str(Path(__file__).parent / "alembic"))
+    with engine.begin() as connection:
+        Base.metadata.create_all(connection)
+        context = MigrationContext.configure(connection)
+        with Operations.context(context):
+            scripts.get_revision(SEED_REVISION).module.upgrade()
+        context.stamp(scripts, "heads")
+
+def snapshot_to_disk(path: str):
+    """Copy the live database to ``path`` with SQLite's online backup API."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with engine.connect() as connection:
+        source = connection.connection.dbapi_connection
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
@@ -0,0 +1,237 @@
+# apps/api/debate_service/db_writer.py
+#
+# Optional single-writer mode for SQLite. When DEBATE_WRITE_COORDINATOR=1 every
+# mutating operation is handed to one writer thread per worker process, which
+# group-commits whatever has queued up in a single BEGIN IMMEDIATE transaction.
+# Writer threads in different uvicorn workers serialise on an flock() around
+# each batch, so they queue on the lock instead of spinning on
+# "database is locked". Readers keep using SessionLocal and are unaffected.
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from debate_service.db import DATABASE_URL, SessionLocal, set_sqlite_pragmas
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOp = Callable[[Session], T]
+
+ENABLED = os.getenv("DEBATE_WRITE_COORDINATOR", "0") == "1"
+MAX_BATCH = int(os.getenv("DEBATE_WRITE_MAX_BATCH", "64"))
+MAX_DELAY_SECONDS = float(os.getenv("DEBATE_WRITE_MAX_DELAY_MS", "5")) / 1000
+
+_STOP = object()
+
+
+def make_writer_engine(url: str = DATABASE_URL) -> Engine:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", set_sqlite_pragmas)
+
+    # Take the write lock up front instead of upgrading from a read lock
+    # half-way through the batch, which is what produces SQLITE_BUSY.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+def _lock_path(url: str) -> str | None:
+    database = url.split("///", 1)[-1] if url.startswith("sqlite") else ""
+    if not database or database.startswith(":memory:") or "mode=memory" in url:
+        return None
+    return database + ".write-lock"
+
+
+class _Job:
+    __slots__ = ("op", "future")
+
+    def __init__(self, op: WriteOp, future: Future):
+        self.op = op
+        self.future = future
+
+
+class WriteCoordinator:
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        max_batch: int = MAX_BATCH,
+        max_delay: float = MAX_DELAY_SECONDS,
+        lock_path: str | None = None,
+    ):
+        self.engine = engine or make_writer_engine()
+        self.session_factory = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.lock_path = lock_path if lock_path is not None else _lock_path(str(self.engine.url))
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """Flush everything already queued, then stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, op: WriteOp) -> Future:
+        if self._thread is None:
+            raise RuntimeError("WriteCoordinator is not running")
+        future: Future = Future()
+        self._queue.put(_Job(op, future))
+        return future
+
+    async def run(self, op: WriteOp[T]) -> T:
+        return await asyncio.wrap_future(self.submit(op))
+
+    def _collect(self, first: _Job) -> tuple[list[_Job], bool]:
+        batch = [first]
+        stopping = False
+        # max_delay bounds the whole batch, so a steady trickle of writes
+        # cannot hold the first caller for max_batch * max_delay.
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if job is _STOP:
+                stopping = True
+                break
+            batch.append(job)
+        return batch, stopping
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            batch, stopping = self._collect(job)
+            self._safe_commit(batch)
+            if stopping:
+                # Anything that raced in behind the stop marker is still written.
+                rest = []
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not _STOP:
+                        rest.append(item)
+                if rest:
+                    self._safe_commit(rest)
+                return
+
+    def _safe_commit(self, batch: list[_Job]):
+        # Anything escaping _commit_batch (e.g. the lock file cannot be
+        # opened) fails this batch's callers but must not kill the thread.
+        try:
+            self._commit_batch(batch)
+        except Exception as exc:
+            logger.exception("Write batch of %d op(s) failed", len(batch))
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+
+    def _commit_batch(self, batch: list[_Job]):
+        lock_file = None
+        if self.lock_path and fcntl is not None:
+            lock_file = open(self.lock_path, "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            results = []
+            with self.session_factory() as session:
+                try:
+                    for job in batch:
+                        # Each op runs in its own savepoint so one bad write only
+                        # fails its own caller, not the whole group commit.
+                        savepoint = session.begin_nested()
+                        try:
+                            result = job.op(session)
+                            savepoint.commit()
+                            results.append((job, result, None))
+                        except Exception as exc:
+                            savepoint.rollback()
+                            results.append((job, None, exc))
+                    session.commit()
+                except Exception as exc:
+                    session.rollback()
+                    for job in batch:
+                        job.future.set_exception(exc)
+                    return
+            for job, result, exc in results:
+                if exc is not None:
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(result)
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+
+_coordinator: WriteCoordinator | None = None
+
+
+def get_coordinator() -> WriteCoordinator | None:
+    return _coordinator
+
+
+def start_coordinator(engine: Engine | None = None) -> WriteCoordinator:
+    global _coordinator
+    if _coordinator is None:
+        _coordinator = WriteCoordinator(engine)
+        _coordinator.start()
+    return _coordinator
+
+
+def stop_coordinator():
+    global _coordinator
+    if _coordinator is not None:
+        _coordinator.stop()
+        _coordinator = None
+
+
+def _run_direct(op: WriteOp[T]) -> T:
+    with SessionLocal(expire_on_commit=False) as session:
+        try:
+            result = op(session)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+
+
+def write(op: WriteOp[T]) -> T:
+    """Run ``op(session)`` as a committed write, via the coordinator if enabled."""
+    if _coordinator is not None:
+        return _coordinator.submit(op).result()
+    return _run_direct(op)
+
+
+async def write_async(op: WriteOp[T]) -> T:
+    if _coordinator is not None:
+        return await _coordinator.run(op)
+    return await asyncio.to_thread(_run_direct, op)
@@ -0,0 +1,221 @@
+# apps/api/debate_service/fanout.py
+#
+# Publish/subscribe hub for spectators. Each committed turn or moderator
+# comment is serialised once and the same bytes are handed to every
+# subscriber of that debate, so the database does no per-viewer work.
+#
+# Every subscriber has a bounded queue. A client that falls behind by more
+# than that is disconnected rather than letting its backlog grow. It then
+# reconnects with the last turn_number it saw. Recent events are kept per
+# debate to serve those resumes from memory; only a client further behind
+# than that window costs one indexed range query.
+#
+# Comments carry the turn_number of the turn they belong to and are replayed
+# for that turn on resume, so a resuming client may see a comment twice and
+# should de-duplicate by comment_id. The hub is per process; with several
+# workers a spectator sees the events published by the worker it is
+# connected to.
+#
+# Nothing is published for a completed debate, so a subscription to one
+# replays the backlog and then ends instead of waiting for events.
+import asyncio
+import logging
+from collections import deque
+
+import orjson
+from sqlalchemy import select
+
+from debate_service.db import SessionLocal
+from debate_service.models.schema import Debate, DebateTurn, ModeratorComment
+from debate_service.services.lifecycle import COMPLETED
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_BUFFER = 256
+HISTORY_SIZE = 200
+
+
+def turn_event(turn: DebateTurn) -> dict:
+    return {
+        "type": "turn",
+        "debate_id": turn.debate_id,
+        "turn_id": turn.turn_id,
+        "turn_number": turn.turn_number,
+        "participant_id": turn.participant_id,
+        "phase": turn.phase,
+        "content": turn.content,
+        "timestamp": turn.timestamp,
+    }
+
+
+def comment_event(comment: ModeratorComment, turn_number: int | None) -> dict:
+    return {
+        "type": "comment",
+        "debate_id": comment.debate_id,
+        "comment_id": comment.comment_id,
+        "turn_id": comment.turn_id,
+        "turn_number": turn_number,
+        "comment_type": comment.comment_type,
+        "content": comment.content,
+        "timestamp": comment.timestamp,
+    }
+
+
+class Subscription:
+    def __init__(self, hub: "FanoutHub", debate_id: str, buffer: int):
+        self.hub = hub
+        self.debate_id = debate_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self.dropped = False
+
+    def offer(self, turn_number: int | None, payload: bytes) -> bool:
+        try:
+            self.queue.put_nowait((turn_number, payload))
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> tuple[int | None, bytes]:
+        if self.dropped and self.queue.empty():
+            raise StopAsyncIteration
+        item = await self.queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+    def close(self):
+        self.hub._unsubscribe(self)
+
+
+class FanoutHub:
+    def __init__(self, subscriber_buffer: int = SUBSCRIBER_BUFFER, history_size: int = HISTORY_SIZE):
+        self.subscriber_buffer = subscriber_buffer
+        self.history_size = history_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._history: dict[str, deque[tuple[int | None, bool, bytes]]] = {}
+
+    def subscriber_count(self, debate_id: str) -> int:
+        return len(self._subscribers.get(debate_id, ()))
+
+    def publish(self, debate_id: str, event: dict):
+        payload = orjson.dumps(event)
+        turn_number = event.get("turn_number")
+        history = self._history.setdefault(debate_id, deque(maxlen=self.history_size))
+        history.append((turn_number, event["type"] == "comment", payload))
+
+        slow = [sub for sub in self._subscribers.get(debate_id, ()) if not sub.offer(turn_number, payload)]
+        for sub in slow:
+            logger.info("Dropping slow spectator of debate %s", debate_id)
+            self._unsubscribe(sub)
+
+    def publish_turn(self, turn: DebateTurn):
+        self.publish(turn.debate_id, turn_event(turn))
+
+    def publish_comment(self, comment: ModeratorComment, turn_number: int | None = None):
+        self.publish(comment.debate_id, comment_event(comment, turn_number))
+
+    async def subscribe(self, debate_id: str, after_turn: int | None = None) -> Subscription:
+        """Subscribe to a debate, first replaying events after ``after_turn`` if given.
+
+        Raises LookupError for an unknown debate. For a completed debate the
+        subscription replays the backlog (all of it without ``after_turn``)
+        and then ends.
+        """
+        while True:
+            sub = Subscription(self, debate_id, self.subscriber_buffer)
+            # Register before loading the backlog so nothing published meanwhile is missed
+            self._subscribers.setdefault(debate_id, set()).add(sub)
+            # Read the status after registering: a debate completing from here
+            # on ends this subscription through forget()
+            status = await asyncio.to_thread(self._status, debate_id)
+            if status is None:
+                self._unsubscribe(sub)
+                raise LookupError(f"Debate {debate_id} not found")
+            finished = status == COMPLETED
+            if finished and after_turn is None:
+                after_turn = 0
+            if after_turn is None:
+                return sub
+
+            backlog = self._recent(debate_id, after_turn)
+            if backlog is None:
+                backlog = await asyncio.to_thread(self._load_backlog, debate_id, after_turn)
+            if not sub.dropped:
+                break
+            # Overflowed while the backlog loaded and was unsubscribed, so
+            # events are missing after the buffered ones; start over.
+        live = []
+        while not sub.queue.empty():
+            live.append(sub.queue.get_nowait())
+        replayed = {payload for _, payload in backlog}
+        items = backlog + [item for item in live if item[1] not in replayed]
+        sub.queue = asyncio.Queue(maxsize=len(items) + self.subscriber_buffer)
+        sub.dropped = False
+        for item in items:
+            sub.queue.put_nowait(item)
+        if finished:
+            self._unsubscribe(sub)
+            sub.queue.put_nowait(None)
+        return sub
+
+    def forget(self, debate_id: str):
+        """Drop the replay history of a finished debate and end its subscriptions."""
+        self._history.pop(debate_id, None)
+        for sub in list(self._subscribers.get(debate_id, ())):
+            try:
+                sub.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                sub.dropped = True
+            self._unsubscribe(sub)
+
+    def _unsubscribe(self, sub: Subscription):
+        subs = self._subscribers.get(sub.debate_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.debate_id]
+
+    def _recent(self, debate_id: str, after_turn: int) -> list[tuple[int | None, bytes]] | None:
+        """Serve a resume from history, or None if it does not reach back far enough."""
+        history = self._history.get(debate_id)
+        if not history:
+            return None
+        # Comments are published late and can outlive their turn's event, so
+        # only turn events say how far back the history reaches. Turn
+        # ``after_turn`` itself must still be held for its comments to be.
+        oldest_turn = next((n for n, is_comment, _ in history if n is not None and not is_comment), None)
+        if oldest_turn is None or oldest_turn > max(after_turn, 1):
+            return None
+        return [
+            (n, payload) for n, is_comment, payload in history
+            if n is not None and (n > after_turn or (is_comment and n == after_turn))
+        ]
+
+    def _status(self, debate_id: str) -> str | None:
+        with SessionLocal() as session:
+            return session.execute(select(Debate.status).where(Debate.debate_id == debate_id)).scalar()
+
+    def _load_backlog(self, debate_id: str, after_turn: int) -> list[tuple[int | None, bytes]]:
+        with SessionLocal() as session:
+            turns = session.execute(
+                select(DebateTurn)
+                .where(DebateTurn.debate_id == debate_id, DebateTurn.turn_number > after_turn)
+                .order_by(DebateTurn.turn_number)
+            ).scalars().all()
+            comments = session.execute(
+                select(ModeratorComment, DebateTurn.turn_number)
+                .join(DebateTurn, ModeratorComment.turn_id == DebateTurn.turn_id)
+                .where(ModeratorComment.debate_id == debate_id, DebateTurn.turn_number >= after_turn)
+                .order_by(ModeratorComment.timestamp)
+            ).all()
+            events = [(t.turn_number, 0, turn_event(t)) for t in turns]
+            events += [(n, 1, comment_event(c, n)) for c, n in comments]
+        events.sort(key=lambda e: (e[0], e[1]))
+        return [(n, orjson.dumps(event)) for n, _, event in events]
+
+
+hub = FanoutHub()
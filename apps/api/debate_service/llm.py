@@ -0,0 +1,54 @@
+# apps/api/debate_service/llm.py
+#
+# LangChain takes seconds to import, so nothing in this module pulls it in at
+# import time. Each accessor imports on first call and caches the result;
+# prewarm() can be used to pay the cost before traffic arrives.
+#
+# LangChain builds an HTTP client for every chat model. Providers that accept
+# an httpx client are given the process-wide pool from http_client instead,
+# so a debate's turns reuse connections rather than reconnecting each turn.
+import importlib
+import json
+import os
+from functools import lru_cache
+
+from debate_service.http_client import get_http_client
+from debate_service.services.catalog import LLMConfigInfo
+
+# Seeded configs name bare models ("llama3") that LangChain cannot map to a
+# provider, so configs without a "provider" key go to an OpenAI-compatible
+# endpoint (Ollama, vLLM, ...) set by LLM_BASE_URL.
+DEFAULT_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+BASE_URL = os.getenv("LLM_BASE_URL")
+# Providers whose chat models take an ``http_async_client``
+POOLED_PROVIDERS = {"openai", "azure_openai"}
+
+LAZY_MODULES = (
+    "langchain.chat_models",
+)
+
+
+@lru_cache(maxsize=None)
+def _module(name: str):
+    return importlib.import_module(name)
+
+
+def init_chat_model(config: LLMConfigInfo):
+    params = json.loads(config.other_params) if config.other_params else {}
+    provider = params.pop("provider", None) or DEFAULT_PROVIDER
+    if BASE_URL:
+        params.setdefault("base_url", BASE_URL)
+    if provider in POOLED_PROVIDERS:
+        params.setdefault("http_async_client", get_http_client())
+    return _module("langchain.chat_models").init_chat_model(
+        config.model,
+        model_provider=provider,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens,
+        **params,
+    )
+
+
+def prewarm():
+    for name in LAZY_MODULES:
+        _module(name)
@@ -0,0 +1,219 @@
+# apps/api/debate_service/migration_helpers.py
+#
+# Helpers for data migrations on large, hot tables (debate_turns, llm_memory).
+#
+# env.py runs migrations with render_as_batch=True. On SQLite, any batch
+# operation other than a plain add_column copies the whole table inside the
+# migration transaction, which locks the database for as long as the copy
+# takes. Schema changes to hot tables should follow expand/contract instead:
+#
+#   1. expand:   expand_add_column() adds the new nullable column (no copy) and
+#                create_sync_trigger() keeps it filled for rows the running
+#                API writes in the meantime.
+#   2. backfill: online_backfill() fills existing rows in rowid-keyed chunks,
+#                committing each chunk and recording progress in
+#                migration_backfill_progress so an interrupted run resumes.
+#   3. contract: in a later revision, once every worker runs the new code,
+#                drop_sync_trigger() and contract_drop_column().
+#
+# Migration scripts import this module as ``migration_helpers`` (env.py puts
+# debate_service on sys.path). Backfills must be idempotent. A chunk can run
+# twice if the process dies between the update and the progress write.
+import datetime
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Engine
+
+PROGRESS_TABLE = "migration_backfill_progress"
+
+progress_table = sa.table(
+    PROGRESS_TABLE,
+    sa.column("name", sa.String),
+    sa.column("table_name", sa.String),
+    sa.column("last_rowid", sa.Integer),
+    sa.column("rows_done", sa.Integer),
+    sa.column("started_at", sa.DateTime),
+    sa.column("updated_at", sa.DateTime),
+    sa.column("completed_at", sa.DateTime),
+)
+
+
+@dataclass
+class Backfill:
+    name: str  # unique key in the progress table, e.g. "debate_turns.word_count"
+    table: str
+    set_clause: str  # e.g. "word_count = length(content) - length(replace(content, ' ', '')) + 1"
+    where: str | None = None  # extra predicate, e.g. "word_count IS NULL"
+    params: dict = field(default_factory=dict)
+
+
+def ensure_progress_table(bind: Connection | Engine):
+    with _transaction(bind) as conn:
+        conn.exec_driver_sql(f"""
+            CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+                name VARCHAR PRIMARY KEY,
+                table_name VARCHAR NOT NULL,
+                last_rowid INTEGER NOT NULL DEFAULT 0,
+                rows_done INTEGER NOT NULL DEFAULT 0,
+                started_at DATETIME,
+                updated_at DATETIME,
+                completed_at DATETIME
+            )
+        """)
+
+
+def get_progress(bind: Connection | Engine, name: str) -> dict | None:
+    with _transaction(bind) as conn:
+        row = conn.execute(
+            sa.select(progress_table).where(progress_table.c.name == name)
+        ).mappings().first()
+    return dict(row) if row else None
+
+
+@contextmanager
+def _transaction(bind: Connection | Engine):
+    # An Engine gets a real transaction (and commit) per block. A Connection is
+    # used as-is, e.g. inside an Alembic autocommit_block where each statement
+    # commits on its own.
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            yield conn
+    else:
+        yield bind
+
+
+def run_backfill(
+    bind: Connection | Engine,
+    backfill: Backfill,
+    chunk_size: int = 1000,
+    pause: float = 0.0,
+    on_progress: Callable[[dict], None] | None = None,
+) -> int:
+    """Apply ``backfill`` chunk by chunk, resuming from recorded progress.
+
+    Returns the number of rows updated by this run. ``pause`` sleeps between
+    chunks so concurrent writers get the lock.
+    """
+    ensure_progress_table(bind)
+    now = datetime.datetime.utcnow()
+    progress = get_progress(bind, backfill.name)
+    if progress is None:
+        with _transaction(bind) as conn:
+            conn.execute(progress_table.insert().values(
+                name=backfill.name, table_name=backfill.table, last_rowid=0,
+                rows_done=0, started_at=now, updated_at=now,
+            ))
+        progress = get_progress(bind, backfill.name)
+    if progress["completed_at"] is not None:
+        return 0
+
+    extra = f" AND ({backfill.where})" if backfill.where else ""
+    next_bound = sa.text(
+        f"SELECT MAX(rowid) FROM (SELECT rowid FROM {backfill.table} "
+        f"WHERE rowid > :last ORDER BY rowid LIMIT :limit)"
+    )
+    apply_chunk = sa.text(
+        f"UPDATE {backfill.table} SET {backfill.set_clause} "
+        f"WHERE rowid > :last AND rowid <= :upper{extra}"
+    )
+
+    last_rowid = progress["last_rowid"]
+    rows_done = progress["rows_done"]
+    updated = 0
+    while True:
+        with _transaction(bind) as conn:
+            upper = conn.execute(next_bound, {"last": last_rowid, "limit": chunk_size}).scalar()
+            now = datetime.datetime.utcnow()
+            if upper is None:
+                conn.execute(
+                    progress_table.update()
+                    .where(progress_table.c.name == backfill.name)
+                    .values(completed_at=now, updated_at=now)
+                )
+                break
+            result = conn.execute(apply_chunk, {**backfill.params, "last": last_rowid, "upper": upper})
+            updated += result.rowcount
+            rows_done += result.rowcount
+            last_rowid = upper
+            conn.execute(
+                progress_table.update()
+                .where(progress_table.c.name == backfill.name)
+                .values(last_rowid=last_rowid, rows_done=rows_done, updated_at=now)
+            )
+        if on_progress is not None:
+            on_progress({"name": backfill.name, "last_rowid": last_rowid, "rows_done": rows_done})
+        if pause:
+            time.sleep(pause)
+    return updated
+
+
+def online_backfill(op, backfill: Backfill, chunk_size: int = 1000, pause: float = 0.0) -> int:
+    """Run a chunked backfill from inside an Alembic migration.
+
+    The migration transaction is committed first (autocommit_block) so the
+    chunks do not pile up in one long-held write lock. In offline ``--sql``
+    mode a single UPDATE is emitted instead.
+    """
+    context = op.get_context()
+    if context.as_sql:
+        extra = f" WHERE {backfill.where}" if backfill.where else ""
+        op.execute(sa.text(f"UPDATE {backfill.table} SET {backfill.set_clause}{extra}").bindparams(**backfill.params))
+        return 0
+    with context.autocommit_block():
+        return run_backfill(op.get_bind(), backfill, chunk_size=chunk_size, pause=pause)
+
+
+def expand_add_column(op, table: str, column: sa.Column):
+    """Add a column without rebuilding the table.
+
+    SQLite's ADD COLUMN is a schema-only change as long as the column is
+    nullable or has a constant server default.
+    """
+    default = column.server_default
+    if not column.nullable and default is None:
+        raise ValueError(f"{table}.{column.name}: expand columns must be nullable or have a server_default")
+    if default is not None and isinstance(getattr(default, "arg", None), sa.sql.ClauseElement):
+        raise ValueError(f"{table}.{column.name}: expression defaults force a table copy on SQLite")
+    # Deliberately not batch_alter_table: this is a plain ALTER TABLE
+    op.add_column(table, column)
+
+
+def contract_drop_column(op, table: str, column_name: str):
+    """Drop a column with ALTER TABLE DROP COLUMN (SQLite 3.35+), without a table copy.
+
+    Indexes, constraints and triggers on the column must be dropped first.
+    """
+    op.drop_column(table, column_name)
+
+
+def _sync_trigger_names(table: str, column: str) -> tuple[str, str]:
+    return f"trg_{table}_{column}_sync_insert", f"trg_{table}_{column}_sync_update"
+
+
+def create_sync_trigger(op, table: str, column: str, expression: str, source_columns: list[str]):
+    """Keep ``column`` = ``expression`` for rows written while the backfill runs.
+
+    ``expression`` refers to the new row as NEW, e.g. ``length(NEW.content)``.
+    """
+    insert_trigger, update_trigger = _sync_trigger_names(table, column)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {insert_trigger} AFTER INSERT ON {table}
+        BEGIN
+            UPDATE {table} SET {column} = {expression} WHERE rowid = NEW.rowid;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {update_trigger} AFTER UPDATE OF {", ".join(source_columns)} ON {table}
+        BEGIN
+            UPDATE {table} SET {column} = {expression} WHERE rowid = NEW.rowid;
+        END
+    """)
+
+
+def drop_sync_trigger(op, table: str, column: str):
+    for trigger in _sync_trigger_names(table, column):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
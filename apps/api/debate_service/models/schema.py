@@ -1,10 +1,12 @@
 # apps/api/debate_service/models/schema.py
-from sqlalchemy import Column, String, Boolean, Integer, Float, ForeignKey, DateTime, Text, UniqueConstraint
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
 import datetime
 import uuid
 
+from sqlalchemy import (Boolean, Column, Date, DateTime, Float, ForeignKey,
+                        Integer, String, Text, UniqueConstraint)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
 Base = declarative_base()
 
 def generate_uuid():
@@ -65,6 +67,7 @@ class DebateFormatPhase(Base):
     sequence = Column(Integer, nullable=False)
     prompt_template = Column(Text)
     turn_limit = Column(Integer)
+    time_limit_minutes = Column(Integer)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
@@ -93,12 +96,21 @@ class Debate(Base):
     description = Column(String)
     proposition = Column(Text, nullable=False)
     format_id = Column(String, ForeignKey("debate_formats.format_id"), nullable=False)  # Changed from format string to format_id
-    status = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)
     moderator_id = Column(String, ForeignKey("users.user_id"), nullable=False)
     time_limit_minutes = Column(Integer)
+    # Turn-order state, advanced atomically by services.turns.append_turn
+    next_turn_number = Column(Integer, nullable=False, default=1, server_default="1")
+    current_phase = Column(String)
+    phase_turn_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_side = Column(String)
+    started_at = Column(DateTime)
+    phase_started_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     completed_at = Column(DateTime)
+    # Set once a completed debate's comments and scores are written; from then on it never changes
+    settled_at = Column(DateTime)
     
     # Relationships
     debate_format = relationship("DebateFormat", back_populates="debates")
@@ -232,4 +244,47 @@ class LLMMemory(Base):
     
     __table_args__ = (
         UniqueConstraint('participant_id', 'debate_id', 'memory_key', name='unique_memory_key'),
-    )
\ No newline at end of file
+    )
+
+class BackgroundTask(Base):
+    __tablename__ = "background_tasks"
+    
+    task_id = Column(String, primary_key=True, default=generate_uuid)
+    name = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON kwargs
+    priority = Column(Integer, nullable=False, default=5)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_retries = Column(Integer, nullable=False, default=3)
+    status = Column(String, nullable=False, default="queued")  # 'queued', 'failed'
+    last_error = Column(Text)
+    claimed_by = Column(String)  # TaskRunner.owner holding the task; NULL once released
+    claimed_at = Column(DateTime)  # renewed by the owner's heartbeat; stale claims are taken over
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+# Token usage rollups, maintained by services.usage in the same transaction
+# as each turn insert so reporting never has to scan debate_turns.
+class UsageByDebate(Base):
+    __tablename__ = "usage_by_debate"
+    
+    debate_id = Column(String, ForeignKey("debates.debate_id"), primary_key=True)
+    llm_config_id = Column(String, ForeignKey("llm_configs.config_id"), primary_key=True)
+    turns = Column(Integer, nullable=False, default=0)
+    tokens_used = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+class UsageByDay(Base):
+    __tablename__ = "usage_by_day"
+    
+    day = Column(Date, primary_key=True)
+    llm_config_id = Column(String, ForeignKey("llm_configs.config_id"), primary_key=True)
+    turns = Column(Integer, nullable=False, default=0)
+    tokens_used = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+class ModelPricing(Base):
+    __tablename__ = "model_pricing"
+    
+    model = Column(String, primary_key=True)
+    usd_per_1k_tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
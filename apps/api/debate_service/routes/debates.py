@@ -0,0 +1,153 @@
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from debate_service.db import get_session
+from debate_service.models.schema import (Debate, DebateScore, DebateTurn,
+                                          ModeratorComment)
+from debate_service.response_cache import (IMMUTABLE, REVALIDATE, etag_matches,
+                                           json_response, make_etag,
+                                           not_modified, response_cache)
+from debate_service.services.background import post_comment
+from debate_service.services.catalog import get_catalog
+from debate_service.services.importer import import_stream
+from debate_service.services.lifecycle import ACTIVE
+from debate_service.services.orchestrator import launch, start_debate
+from debate_service.services.writes import COMMENTARY
+
+router = APIRouter()
+
+class CommentIn(BaseModel):
+    content: str
+    comment_type: Literal["commentary", "intervention"] = COMMENTARY
+    turn_id: str | None = None
+
+def _version(session: Session, debate_id: str):
+    # One primary-key lookup; enough to answer a conditional request
+    row = session.execute(
+        select(Debate.next_turn_number, Debate.updated_at, Debate.settled_at)
+        .where(Debate.debate_id == debate_id)
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Debate not found")
+    next_turn_number, updated_at, settled_at = row
+    # Comments and scores still land after completed_at; only settled debates are final
+    cache_control = IMMUTABLE if settled_at is not None else REVALIDATE
+    return next_turn_number - 1, updated_at, cache_control
+
+def _transcript(session: Session, debate_id: str) -> dict:
+    turns = session.execute(
+        select(DebateTurn).where(DebateTurn.debate_id == debate_id).order_by(DebateTurn.turn_number)
+    ).scalars().all()
+    comments = session.execute(
+        select(ModeratorComment).where(ModeratorComment.debate_id == debate_id).order_by(ModeratorComment.timestamp)
+    ).scalars().all()
+    return {
+        "debate_id": debate_id,
+        "turns": [
+            {
+                "turn_id": t.turn_id,
+                "turn_number": t.turn_number,
+                "participant_id": t.participant_id,
+                "phase": t.phase,
+                "content": t.content,
+                "timestamp": t.timestamp,
+                "tokens_used": t.tokens_used,
+            }
+            for t in turns
+        ],
+        "moderator_comments": [
+            {
+                "comment_id": c.comment_id,
+                "turn_id": c.turn_id,
+                "comment_type": c.comment_type,
+                "content": c.content,
+                "timestamp": c.timestamp,
+            }
+            for c in comments
+        ],
+    }
+
+def _verdict(session: Session, debate_id: str) -> dict:
+    scores = session.execute(
+        select(DebateScore)
+        .where(DebateScore.debate_id == debate_id)
+        .options(selectinload(DebateScore.criteria_scores))
+        .order_by(DebateScore.created_at)
+    ).scalars().all()
+    return {
+        "debate_id": debate_id,
+        "scores": [
+            {
+                "score_id": s.score_id,
+                "judge_id": s.judge_id,
+                "winner_side": s.winner_side,
+                "verdict_summary": s.verdict_summary,
+                "criteria": [
+                    {"criteria_id": c.criteria_id, "score_value": c.score_value, "comment": c.comment}
+                    for c in s.criteria_scores
+                ],
+            }
+            for s in scores
+        ],
+    }
+
+def _conditional(request: Request, session: Session, debate_id: str, kind: str, build):
+    last_turn, updated_at, cache_control = _version(session, debate_id)
+    etag = make_etag(kind, debate_id, last_turn, updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    body = response_cache.get(etag)
+    if body is None:
+        body = orjson.dumps(build(session, debate_id))
+        response_cache.put(etag, body)
+    return json_response(body, etag, cache_control)
+
+@router.get("/debates/{debate_id}/transcript")
+def get_transcript(debate_id: str, request: Request, session: Session = Depends(get_session)):
+    return _conditional(request, session, debate_id, "transcript", _transcript)
+
+@router.get("/debates/{debate_id}/verdict")
+def get_verdict(debate_id: str, request: Request, session: Session = Depends(get_session)):
+    return _conditional(request, session, debate_id, "verdict", _verdict)
+
+@router.post("/debates/{debate_id}/start")
+async def start(debate_id: str, run: bool = True, max_turns: int | None = None):
+    """Start a pending debate; with ``run`` the LLM debaters take their turns in the background.
+
+    Without ``max_turns``, a format with an open-ended phase stops once the
+    debate reaches DEBATE_MAX_OPEN_TURNS turns.
+    """
+    started_at = await start_debate(debate_id)
+    if started_at is None:
+        raise HTTPException(status_code=409, detail="Debate does not exist or is not pending")
+    if run:
+        launch(debate_id, max_turns)
+    return {"debate_id": debate_id, "status": ACTIVE, "started_at": started_at}
+
+@router.post("/debates/{debate_id}/comments")
+async def add_comment(debate_id: str, body: CommentIn):
+    """Post a human moderator's comment; an ``intervention`` re-plans the debater's next turn."""
+    try:
+        comment = await post_comment(debate_id, body.turn_id, body.content, body.comment_type)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    if comment is None:
+        raise HTTPException(status_code=409, detail="Debate is settled")
+    return {
+        "comment_id": comment.comment_id,
+        "turn_id": comment.turn_id,
+        "comment_type": comment.comment_type,
+        "content": comment.content,
+        "timestamp": comment.timestamp,
+    }
+
+@router.post("/debates/import")
+async def import_debates(request: Request, batch_size: int = 500):
+    """Bulk-import NDJSON debates (one per line); see services/importer.py for the format."""
+    report = await import_stream(request.stream(), get_catalog(), batch_size=batch_size)
+    return report.as_dict()
@@ -0,0 +1,49 @@
+from fastapi import (APIRouter, Header, HTTPException, Query, WebSocket,
+                     WebSocketDisconnect, status)
+from fastapi.responses import StreamingResponse
+
+from debate_service.fanout import hub
+
+router = APIRouter()
+
+@router.websocket("/debates/{debate_id}/ws")
+async def spectate_ws(websocket: WebSocket, debate_id: str, after: int | None = Query(None)):
+    try:
+        subscription = await hub.subscribe(debate_id, after_turn=after)
+    except LookupError:
+        # Closing before accept() rejects the handshake
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Debate not found")
+        return
+    try:
+        await websocket.accept()
+        async for _, payload in subscription:
+            await websocket.send_bytes(payload)
+        # Dropped as a slow consumer or the debate ended; the client resumes with ?after=
+        await websocket.close(code=1013 if subscription.dropped else 1000)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
+@router.get("/debates/{debate_id}/events")
+async def spectate_sse(
+    debate_id: str,
+    after: int | None = Query(None),
+    last_event_id: int | None = Header(None),
+):
+    # EventSource reconnects send the id of the last event they saw
+    after_turn = last_event_id if last_event_id is not None else after
+    try:
+        subscription = await hub.subscribe(debate_id, after_turn=after_turn)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Debate not found")
+
+    async def stream():
+        try:
+            async for turn_number, payload in subscription:
+                event_id = f"id: {turn_number}\n" if turn_number is not None else ""
+                yield f"{event_id}data: {payload.decode()}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
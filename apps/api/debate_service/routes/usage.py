@@ -0,0 +1,41 @@
+import datetime
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from debate_service.db import get_session
+from debate_service.db_writer import write
+from debate_service.services import usage
+from debate_service.services.catalog import get_catalog
+
+router = APIRouter(prefix="/usage")
+
+class PriceIn(BaseModel):
+    usd_per_1k_tokens: float = Field(ge=0)
+
+@router.get("/daily")
+def daily_usage(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    llm_config_id: str | None = None,
+    session: Session = Depends(get_session),
+):
+    return usage.usage_by_day(session, get_catalog(), start, end, llm_config_id)
+
+@router.get("/models")
+def model_usage(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    session: Session = Depends(get_session),
+):
+    return usage.usage_by_model(session, get_catalog(), start, end)
+
+@router.get("/debates/{debate_id}")
+def debate_usage(debate_id: str, session: Session = Depends(get_session)):
+    return usage.usage_for_debate(session, get_catalog(), debate_id)
+
+@router.put("/pricing/{model}")
+def set_model_price(model: str, price: PriceIn):
+    write(lambda session: usage.set_price(session, model, price.usd_per_1k_tokens))
+    return {"model": model, "usd_per_1k_tokens": price.usd_per_1k_tokens}
@@ -0,0 +1,246 @@
+# apps/api/debate_service/scheduler.py
+#
+# In-process deadline scheduler for Debate.time_limit_minutes and
+# DebateFormatPhase.time_limit_minutes. Deadlines live in a heap, so
+# registering one and firing one cost O(log n) and nothing polls the debates
+# table. The heap is rebuilt from active debates once at startup.
+#
+# The same scan finds debates that completed but never settled because the
+# process stopped before its settle_debate task ran. It registers a "settle"
+# deadline for each one, SETTLE_GRACE_MINUTES after completion, so a sibling
+# worker still judging the debate gets to finish first.
+#
+# Each debate has at most one live deadline per kind ("debate", "phase", "settle").
+# Re-registering replaces the old one by lazy deletion: superseded heap
+# entries are skipped when they surface. Firing goes through the
+# compare-and-set transitions in services.lifecycle, so a deadline that went
+# stale, or that another worker's scheduler already fired, changes nothing.
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+import os
+from functools import partial
+
+from sqlalchemy import select
+
+from debate_service.db import SessionLocal
+from debate_service.db_writer import write_async
+from debate_service.fanout import hub
+from debate_service.models.schema import Debate
+from debate_service.services import background, lifecycle
+from debate_service.services.catalog import get_catalog
+from debate_service.tasks import PRIORITY_LOW, get_runner
+
+logger = logging.getLogger(__name__)
+
+DEBATE = "debate"
+PHASE = "phase"
+SETTLE = "settle"
+
+SETTLE_GRACE_MINUTES = int(os.getenv("DEBATE_SETTLE_GRACE_MINUTES", "10"))
+
+
+def _minutes_after(start: datetime.datetime, minutes: int) -> datetime.datetime:
+    return start + datetime.timedelta(minutes=minutes)
+
+
+class DeadlineScheduler:
+    def __init__(self):
+        self._heap: list[tuple[datetime.datetime, int, str, str, tuple]] = []
+        self._live: dict[tuple[str, str], int] = {}
+        self._phases: dict[str, tuple[str, datetime.datetime]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self):
+        return len(self._live)
+
+    # Registration
+
+    def register(self, debate_id: str, kind: str, due_at: datetime.datetime, *args):
+        seq = next(self._seq)
+        self._live[(debate_id, kind)] = seq
+        heapq.heappush(self._heap, (due_at, seq, debate_id, kind, args))
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._live):
+            # Drop superseded entries so cancelled deadlines don't accumulate
+            self._heap = [e for e in self._heap if self._live.get((e[2], e[3])) == e[1]]
+            heapq.heapify(self._heap)
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, debate_id: str, kind: str | None = None):
+        for key in [(debate_id, kind)] if kind else [(debate_id, DEBATE), (debate_id, PHASE)]:
+            self._live.pop(key, None)
+        if kind in (None, PHASE):
+            self._phases.pop(debate_id, None)
+
+    def debate_started(self, debate_id: str, format_id: str, started_at: datetime.datetime, time_limit_minutes: int | None):
+        if time_limit_minutes:
+            self.register(debate_id, DEBATE, _minutes_after(started_at, time_limit_minutes))
+        debate_format = get_catalog().formats.get(format_id)
+        if debate_format and debate_format.phases:
+            self.phase_started(debate_id, format_id, debate_format.phases[0].name, started_at)
+
+    def phase_started(self, debate_id: str, format_id: str, phase: str, started_at: datetime.datetime):
+        self._phases[debate_id] = (phase, started_at)
+        debate_format = get_catalog().formats.get(format_id)
+        phase_info = debate_format.phase(phase) if debate_format else None
+        if phase_info is not None and phase_info.time_limit_minutes:
+            self.register(
+                debate_id, PHASE, _minutes_after(started_at, phase_info.time_limit_minutes),
+                format_id, phase, started_at,
+            )
+        else:
+            self._live.pop((debate_id, PHASE), None)
+
+    def turn_appended(self, debate_id: str, format_id: str, phase: str, timestamp: datetime.datetime):
+        """Call after committing a turn; registers the phase deadline when the turn opened a new phase."""
+        tracked = self._phases.get(debate_id)
+        if tracked is None or tracked[0] != phase:
+            self.phase_started(debate_id, format_id, phase, timestamp)
+
+    async def rebuild(self):
+        """Register deadlines for every active debate (the one scan, at startup)."""
+        def load():
+            with SessionLocal() as session:
+                return session.execute(
+                    select(
+                        Debate.debate_id,
+                        Debate.format_id,
+                        Debate.time_limit_minutes,
+                        Debate.started_at,
+                        Debate.current_phase,
+                        Debate.phase_started_at,
+                    ).where(Debate.status == lifecycle.ACTIVE)
+                ).all()
+
+        def load_unsettled():
+            with SessionLocal() as session:
+                return session.execute(
+                    select(Debate.debate_id, Debate.completed_at)
+                    .where(Debate.status == lifecycle.COMPLETED, Debate.settled_at.is_(None))
+                ).all()
+
+        rows = await asyncio.to_thread(load)
+        for debate_id, format_id, time_limit, started_at, phase, phase_started_at in rows:
+            if started_at and time_limit:
+                self.register(debate_id, DEBATE, _minutes_after(started_at, time_limit))
+            if phase and phase_started_at:
+                self.phase_started(debate_id, format_id, phase, phase_started_at)
+        unsettled = await asyncio.to_thread(load_unsettled)
+        now = datetime.datetime.utcnow()
+        for debate_id, completed_at in unsettled:
+            self.register(debate_id, SETTLE, _minutes_after(completed_at or now, SETTLE_GRACE_MINUTES))
+        logger.info(
+            "Deadline scheduler tracking %d deadline(s) for %d active and %d unsettled debate(s)",
+            len(self), len(rows), len(unsettled),
+        )
+
+    # Firing
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="deadline-scheduler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            timeout = None
+            while self._heap:
+                due_at, seq, debate_id, kind, args = self._heap[0]
+                if self._live.get((debate_id, kind)) != seq:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = (due_at - datetime.datetime.utcnow()).total_seconds()
+                if delay > 0:
+                    timeout = delay
+                    break
+                heapq.heappop(self._heap)
+                del self._live[(debate_id, kind)]
+                try:
+                    await self._fire(debate_id, kind, args)
+                except Exception:
+                    logger.exception("Deadline %s for debate %s failed", kind, debate_id)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, debate_id: str, kind: str, args: tuple):
+        if kind == SETTLE:
+            runner = get_runner()
+            if await runner.stored_elsewhere(debate_id):
+                # Another worker still holds work for this debate
+                self.register(debate_id, SETTLE, _minutes_after(datetime.datetime.utcnow(), SETTLE_GRACE_MINUTES))
+            else:
+                runner.after_drain(debate_id, "settle_debate", priority=PRIORITY_LOW)
+            return
+
+        if kind == DEBATE:
+            if await write_async(partial(lifecycle.complete_debate, debate_id=debate_id)):
+                logger.info("Debate %s reached its time limit", debate_id)
+                await self._completed(debate_id)
+            self.cancel(debate_id)
+            return
+
+        format_id, phase, started_at = args
+        debate_format = get_catalog().formats.get(format_id)
+        if debate_format is None:
+            return
+        opened = await write_async(lambda session: lifecycle.expire_phase(
+            session, debate_id, debate_format, phase, started_at
+        ))
+        if opened is None:
+            # Stale: the phase already moved on
+            self.cancel(debate_id, PHASE)
+        elif opened[0] is None:
+            logger.info("Debate %s ran out of time in its last phase", debate_id)
+            await self._completed(debate_id)
+            self.cancel(debate_id)
+        else:
+            self.phase_started(debate_id, format_id, *opened)
+            hub.publish(debate_id, {"type": "phase", "debate_id": debate_id, "phase": opened[0]})
+
+    async def _completed(self, debate_id: str):
+        hub.publish(debate_id, {"type": "status", "debate_id": debate_id, "status": lifecycle.COMPLETED})
+        hub.forget(debate_id)
+        await background.after_completion(debate_id)
+
+
+_scheduler: DeadlineScheduler | None = None
+
+
+def get_scheduler() -> DeadlineScheduler:
+    if _scheduler is None:
+        raise RuntimeError("Deadline scheduler is not running")
+    return _scheduler
+
+
+def current() -> DeadlineScheduler | None:
+    """The running scheduler, or None outside the API process (scripts, tests)."""
+    return _scheduler
+
+
+async def start_scheduler() -> DeadlineScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = DeadlineScheduler()
+        await _scheduler.rebuild()
+        _scheduler.start()
+    return _scheduler
+
+
+async def stop_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
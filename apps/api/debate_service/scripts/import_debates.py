@@ -0,0 +1,33 @@
+"""Bulk-import debates from an NDJSON file (or stdin with ``-``).
+
+    python scripts/import_debates.py transcripts.ndjson --batch-size 1000
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from debate_service.services import importer  # noqa: E402
+from debate_service.services.catalog import get_catalog  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="NDJSON file, one debate per line, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=importer.BATCH_SIZE, help="debates per transaction")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    with source:
+        report = importer.import_ndjson(source, get_catalog(), batch_size=args.batch_size)
+
+    for error in report.errors:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(json.dumps({k: v for k, v in report.as_dict().items() if k != "errors"}))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Measure API cold-start import cost with ``python -X importtime``.
+
+Run from anywhere: ``python debate_service/scripts/import_time.py``. Exits
+non-zero when ``import main`` exceeds the budget or eagerly imports one of the
+modules that must stay lazy.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+MUST_STAY_LAZY = ("langchain", "langgraph", "langsmith", "openai")
+
+
+def measure(module: str = "main"):
+    """Return (total_ms, {module: cumulative_ms}) for importing ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Nesting is encoded as two extra spaces of indentation per level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        cumulative[name] = int(cumulative_us) / 1000
+        if depth == 0:
+            total_us += int(cumulative_us)
+    return total_us / 1000, cumulative
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    total_ms, cumulative = measure(args.module)
+    for name, ms in sorted(cumulative.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"{ms:10.1f} ms  {name}")
+    print(f"\nimport {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    eager = sorted(
+        name for name in cumulative if name.split(".")[0] in MUST_STAY_LAZY
+    )
+    if eager:
+        failures.append(f"eagerly imported: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"over budget by {total_ms - args.budget_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
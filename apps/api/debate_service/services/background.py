@@ -0,0 +1,245 @@
+# apps/api/debate_service/services/background.py
+#
+# Background task handlers for work that follows a turn. Importing this module
+# registers them with debate_service.tasks.
+import asyncio
+import json
+from functools import partial
+
+from debate_service import llm
+from debate_service.db import SessionLocal
+from debate_service.db_writer import write_async
+from debate_service.fanout import hub
+from debate_service.models.schema import (Debate, DebateParticipant,
+                                          DebateScore, DebateTurn, User)
+from debate_service.services import lifecycle, prompts
+from debate_service.services.catalog import get_catalog
+from debate_service.services.writes import (COMMENTARY, INTERVENTION,
+                                            WINNER_SIDES, add_comment,
+                                            record_score, save_checkpoint,
+                                            turn_has_comment)
+from debate_service.tasks import PRIORITY_LOW, PRIORITY_NORMAL, current, task
+
+MODERATOR_CONTEXT_TURNS = 6
+INTERVENTION_PREFIX = "INTERVENTION:"
+
+
+def _moderator_context(debate_id: str, turn_id: str):
+    with SessionLocal() as session:
+        debate = session.get(Debate, debate_id)
+        if debate is None or turn_has_comment(turn_id, session):
+            return None
+        config_id = session.query(User.llm_config_id).filter(User.user_id == debate.moderator_id).scalar()
+        turns = (
+            session.query(DebateTurn)
+            .filter(DebateTurn.debate_id == debate_id)
+            .order_by(DebateTurn.turn_number.desc())
+            .limit(MODERATOR_CONTEXT_TURNS)
+            .all()
+        )
+        sides = dict(
+            session.query(DebateParticipant.participant_id, DebateParticipant.side)
+            .filter(DebateParticipant.debate_id == debate_id)
+            .all()
+        )
+        return debate.proposition, config_id, list(reversed(turns)), sides
+
+
+@task("moderator_comment")
+async def moderator_comment(debate_id: str, turn_id: str):
+    # A restored task may already have commented before its owner died
+    context = await asyncio.to_thread(_moderator_context, debate_id, turn_id)
+    if context is None:
+        return
+    proposition, config_id, turns, sides = context
+    config = get_catalog().llm_configs.get(config_id) if config_id else None
+    if config is None:
+        # Human moderators comment through POST /debates/{debate_id}/comments
+        return
+
+    system_prompt = prompts.render(
+        config.base_prompt,
+        proposition=proposition,
+        role="MODERATOR",
+        position="",
+        context=prompts.transcript(turns, sides),
+    )
+    reply = await llm.init_chat_model(config).ainvoke([
+        ("system", system_prompt),
+        ("human", (
+            "Give a brief moderator comment on the latest turn. If a debater broke the format "
+            f"or left the proposition, start your reply with {INTERVENTION_PREFIX} and tell them what to correct."
+        )),
+    ])
+    content, comment_type = reply.content.strip(), COMMENTARY
+    if content.startswith(INTERVENTION_PREFIX):
+        content, comment_type = content[len(INTERVENTION_PREFIX):].strip(), INTERVENTION
+    turn_number = next((t.turn_number for t in turns if t.turn_id == turn_id), None)
+    await post_comment(debate_id, turn_id, content, comment_type, turn_number=turn_number, once_per_turn=True)
+
+
+async def post_comment(
+    debate_id: str,
+    turn_id: str | None,
+    content: str,
+    comment_type: str = COMMENTARY,
+    turn_number: int | None = None,
+    once_per_turn: bool = False,
+):
+    """Write a moderator comment and fan it out; returns None if nothing was written.
+
+    Nothing is written once the debate is settled, or with ``once_per_turn``
+    when ``turn_id`` already has a comment.
+
+    An intervention also makes a debate running in this process drop its
+    speculatively prepared next turn, so that turn is prepared again with
+    the intervention in its context.
+    """
+    def op(session):
+        if once_per_turn and turn_id is not None and turn_has_comment(turn_id, session):
+            return None, None
+        comment = add_comment(debate_id, turn_id, content, comment_type, session)
+        number = turn_number
+        if comment is not None and number is None and turn_id is not None:
+            number = session.query(DebateTurn.turn_number).filter(DebateTurn.turn_id == turn_id).scalar()
+        return comment, number
+
+    comment, number = await write_async(op)
+    if comment is None:
+        return None
+    hub.publish_comment(comment, number)
+    if comment_type == INTERVENTION:
+        # Imported here because the orchestrator queues its follow-up work through this module
+        from debate_service.services.orchestrator import intervene
+        intervene(debate_id)
+    return comment
+
+
+def _judging_context(debate_id: str):
+    with SessionLocal() as session:
+        debate = session.get(Debate, debate_id)
+        if debate is None:
+            return None
+        participants = (
+            session.query(DebateParticipant.participant_id, DebateParticipant.side, User.llm_config_id)
+            .join(User, User.user_id == DebateParticipant.user_id)
+            .filter(DebateParticipant.debate_id == debate_id)
+            .all()
+        )
+        # Judges that already scored are skipped, so a retried task is safe
+        scored = {
+            judge_id for (judge_id,) in
+            session.query(DebateScore.judge_id).filter(DebateScore.debate_id == debate_id).all()
+        }
+        turns = (
+            session.query(DebateTurn)
+            .filter(DebateTurn.debate_id == debate_id)
+            .order_by(DebateTurn.turn_number)
+            .all()
+        )
+        sides = {participant_id: side for participant_id, side, _ in participants}
+        judges = [
+            (participant_id, config_id) for participant_id, side, config_id in participants
+            if side == "judge" and participant_id not in scored
+        ]
+        return debate.proposition, judges, turns, sides
+
+
+def _parse_verdict(content: str, criteria) -> tuple[dict[str, int], str | None, str | None]:
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("Judge reply contains no JSON object")
+    verdict = json.loads(content[start:end + 1])
+    scores = verdict.get("scores") or {}
+    criteria_scores = {
+        c.criteria_id: max(0, min(c.max_score, int(scores[c.name])))
+        for c in criteria
+        if isinstance(scores.get(c.name), (int, float))
+    }
+    winner = verdict.get("winner")
+    return criteria_scores, winner if winner in WINNER_SIDES else None, verdict.get("summary")
+
+
+@task("judge_debate")
+async def judge_debate(debate_id: str):
+    context = await asyncio.to_thread(_judging_context, debate_id)
+    if context is None:
+        return
+    proposition, judges, turns, sides = context
+    catalog = get_catalog()
+    criteria = list(catalog.criteria.values())
+    rubric = "\n".join(f"- {c.name} (0-{c.max_score})" for c in criteria)
+    for judge_id, config_id in judges:
+        config = catalog.llm_configs.get(config_id) if config_id else None
+        if config is None:
+            # Human judges score through the API themselves
+            continue
+        system_prompt = prompts.render(
+            config.base_prompt,
+            proposition=proposition,
+            role="JUDGE",
+            position="",
+            context=prompts.transcript(turns, sides),
+        )
+        reply = await llm.init_chat_model(config).ainvoke([
+            ("system", system_prompt),
+            ("human", (
+                f"Score the debate on these criteria:\n{rubric}\n"
+                'Answer with JSON only: {"scores": {"<criterion>": <score>, ...}, '
+                '"winner": "affirmative" | "negative" | "tie", "summary": "<one paragraph>"}'
+            )),
+        ])
+        criteria_scores, winner, summary = _parse_verdict(reply.content, criteria)
+        await write_async(partial(record_score, debate_id, judge_id, winner, summary, criteria_scores))
+
+
+@task("settle_debate")
+async def settle_debate_task(debate_id: str):
+    await write_async(partial(lifecycle.settle_debate, debate_id=debate_id))
+
+
+@task("save_checkpoint")
+async def save_checkpoint_task(debate_id: str, last_turn_id: str, checkpoint_data: str):
+    await write_async(partial(save_checkpoint, debate_id, last_turn_id, checkpoint_data))
+
+
+@task("record_score")
+async def record_score_task(
+    debate_id: str,
+    judge_id: str,
+    criteria_scores: dict[str, int],
+    winner_side: str | None = None,
+    verdict_summary: str | None = None,
+):
+    await write_async(partial(record_score, debate_id, judge_id, winner_side, verdict_summary, criteria_scores))
+
+
+async def after_turn(debate_id: str, turn_id: str, checkpoint_data: str | None = None):
+    """Queue the follow-up work for a committed turn; a no-op without a task runner."""
+    runner = current()
+    if runner is None:
+        return
+    await runner.submit("moderator_comment", priority=PRIORITY_NORMAL, debate_id=debate_id, turn_id=turn_id)
+    if checkpoint_data is not None:
+        await runner.submit(
+            "save_checkpoint",
+            priority=PRIORITY_LOW,
+            debate_id=debate_id,
+            last_turn_id=turn_id,
+            checkpoint_data=checkpoint_data,
+        )
+
+
+async def after_completion(debate_id: str):
+    """Queue the judging of a debate that just completed, then settle it.
+
+    Settling waits for every task this process holds for the debate (the last
+    turn's comment, judging, retries). Work queued in another worker that
+    lands after that is dropped rather than changing an immutable response.
+    A no-op without a task runner.
+    """
+    runner = current()
+    if runner is None:
+        return
+    await runner.submit("judge_debate", priority=PRIORITY_LOW, debate_id=debate_id)
+    runner.after_drain(debate_id, "settle_debate", priority=PRIORITY_LOW)
@@ -0,0 +1,132 @@
+# apps/api/debate_service/services/catalog.py
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy.orm import Session, selectinload
+
+from debate_service.db import SessionLocal
+from debate_service.models.schema import (DebateFormat, LLMConfig,
+                                          ScoringCriteria)
+
+
+# Read-only snapshots of the seeded reference tables. They are plain objects so
+# they can be shared across requests and threads without an open session.
+@dataclass(frozen=True)
+class PhaseInfo:
+    phase_id: str
+    format_id: str
+    name: str
+    sequence: int
+    prompt_template: str | None
+    turn_limit: int | None
+    time_limit_minutes: int | None = None
+
+
+@dataclass(frozen=True)
+class FormatInfo:
+    format_id: str
+    name: str
+    structure: str
+    phases: tuple[PhaseInfo, ...]
+
+    def phase(self, name: str) -> PhaseInfo | None:
+        for phase in self.phases:
+            if phase.name == name:
+                return phase
+        return None
+
+
+@dataclass(frozen=True)
+class CriteriaInfo:
+    criteria_id: str
+    name: str
+    max_score: int
+    weight: float
+
+
+@dataclass(frozen=True)
+class LLMConfigInfo:
+    config_id: str
+    name: str
+    model: str
+    base_prompt: str
+    temperature: float
+    max_tokens: int | None
+    other_params: str | None
+
+
+@dataclass(frozen=True)
+class Catalog:
+    formats: dict[str, FormatInfo] = field(default_factory=dict)
+    criteria: dict[str, CriteriaInfo] = field(default_factory=dict)
+    llm_configs: dict[str, LLMConfigInfo] = field(default_factory=dict)
+
+    def format_by_name(self, name: str) -> FormatInfo | None:
+        for debate_format in self.formats.values():
+            if debate_format.name == name:
+                return debate_format
+        return None
+
+
+def load_catalog(session: Session) -> Catalog:
+    formats = {}
+    query = session.query(DebateFormat).options(selectinload(DebateFormat.format_phases))
+    for row in query:
+        phases = tuple(
+            PhaseInfo(
+                phase_id=p.phase_id,
+                format_id=p.format_id,
+                name=p.name,
+                sequence=p.sequence,
+                prompt_template=p.prompt_template,
+                turn_limit=p.turn_limit,
+                time_limit_minutes=p.time_limit_minutes,
+            )
+            for p in sorted(row.format_phases, key=lambda p: p.sequence)
+        )
+        formats[row.format_id] = FormatInfo(
+            format_id=row.format_id, name=row.name, structure=row.structure, phases=phases
+        )
+
+    criteria = {
+        row.criteria_id: CriteriaInfo(
+            criteria_id=row.criteria_id, name=row.name, max_score=row.max_score, weight=row.weight
+        )
+        for row in session.query(ScoringCriteria)
+    }
+
+    llm_configs = {
+        row.config_id: LLMConfigInfo(
+            config_id=row.config_id,
+            name=row.name,
+            model=row.model,
+            base_prompt=row.base_prompt,
+            temperature=row.temperature,
+            max_tokens=row.max_tokens,
+            other_params=row.other_params,
+        )
+        for row in session.query(LLMConfig)
+    }
+
+    return Catalog(formats=formats, criteria=criteria, llm_configs=llm_configs)
+
+
+_catalog: Catalog | None = None
+_catalog_lock = Lock()
+
+
+def get_catalog() -> Catalog:
+    """Return the process-wide catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                with SessionLocal() as session:
+                    _catalog = load_catalog(session)
+    return _catalog
+
+
+def invalidate_catalog():
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
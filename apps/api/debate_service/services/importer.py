@@ -0,0 +1,479 @@
+# apps/api/debate_service/services/importer.py
+#
+# Bulk import of debates from NDJSON, one debate per line:
+#
+#   {"title": ..., "proposition": ..., "format": "Oxford Style",
+#    "status": "completed", "created_at": "...", "completed_at": "...",
+#    "moderator_email": "admin@example.com",
+#    "participants": [{"key": "aff", "side": "affirmative", "username": "...",
+#                      "email": "...", "llm_config": "Llama3 (Balanced)"}, ...],
+#    "turns": [{"participant": "aff", "turn_number": 1, "phase": "opening_pro",
+#               "content": "...", "timestamp": "...", "tokens_used": 512}, ...],
+#    "comments": [{"turn_number": 1, "content": "...", "comment_type": "commentary"}],
+#    "scores": [{"judge": "j1", "winner_side": "negative", "verdict_summary": "...",
+#                "criteria": {"Logical Reasoning": 8, ...}}]}
+#
+# Every line is validated against the catalog (format, phases, LLM configs,
+# scoring criteria) and turned into plain row dicts with IDs generated in
+# memory, so no flushes or lookups happen per object. Each batch of debates
+# is written with one executemany INSERT per table in a single transaction.
+# Lines that fail validation are skipped and reported with their line
+# number.
+import asyncio
+import datetime
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import AsyncIterator, Iterable
+
+import orjson
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from debate_service.db import SessionLocal
+from debate_service.db_writer import write, write_async
+from debate_service.models.schema import (CriteriaScore, Debate,
+                                          DebateParticipant, DebateScore,
+                                          DebateTurn, ModeratorComment, User,
+                                          generate_uuid)
+from debate_service.services.catalog import Catalog
+from debate_service.services.lifecycle import ACTIVE, COMPLETED, PENDING
+from debate_service.services.turns import TurnOrderError, validate_turn
+from debate_service.services.usage import record_bulk_usage
+from debate_service.services.writes import (COMMENT_TYPES, COMMENTARY,
+                                            WINNER_SIDES)
+
+BATCH_SIZE = 500
+SIDES = ("affirmative", "negative", "moderator", "judge")  # as documented on DebateParticipant.side
+STATUSES = (PENDING, ACTIVE, COMPLETED)
+
+
+class ImportValidationError(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    debates: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    errors: list[dict] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "debates": self.debates,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class _Batch:
+    users: list[dict] = field(default_factory=list)
+    debates: list[dict] = field(default_factory=list)
+    participants: list[dict] = field(default_factory=list)
+    turns: list[dict] = field(default_factory=list)
+    comments: list[dict] = field(default_factory=list)
+    scores: list[dict] = field(default_factory=list)
+    criteria_scores: list[dict] = field(default_factory=list)
+    llm_config_ids: dict[str, str] = field(default_factory=dict)
+    # email -> (user_id, llm_config_id) for users this batch creates
+    users_by_email: dict[str, tuple[str, str | None]] = field(default_factory=dict)
+    line_numbers: list[int] = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.debates)
+
+    def row_count(self) -> int:
+        return sum(len(rows) for rows in (
+            self.users, self.debates, self.participants, self.turns,
+            self.comments, self.scores, self.criteria_scores,
+        ))
+
+
+def _timestamp(value, default: datetime.datetime | None) -> datetime.datetime | None:
+    if value is None:
+        return default
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ImportValidationError(f"Invalid timestamp {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _require(record: dict, key: str, where: str = "debate") -> str:
+    value = record.get(key)
+    if value in (None, ""):
+        raise ImportValidationError(f"{where}: '{key}' is required")
+    if not isinstance(value, str):
+        raise ImportValidationError(f"{where}: '{key}' must be a string")
+    return value
+
+
+def _optional(record: dict, key: str, kind: type, where: str = "debate"):
+    value = record.get(key)
+    # bool is an int subclass but never a valid count or number here
+    if value is not None and (not isinstance(value, kind) or (kind is int and isinstance(value, bool))):
+        raise ImportValidationError(f"{where}: '{key}' must be {kind.__name__} or null")
+    return value
+
+
+def _objects(record: dict, key: str, where: str = "debate") -> list[dict]:
+    value = record.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise ImportValidationError(f"{where}: '{key}' must be a list of objects")
+    return value
+
+
+class DebateImporter:
+    """Validates debates into row batches; not thread-safe."""
+
+    def __init__(self, catalog: Catalog, users_by_email: dict[str, tuple[str, str | None]]):
+        self.catalog = catalog
+        # email -> (user_id, llm_config_id) for existing and already-imported users
+        self.users_by_email = dict(users_by_email)
+        self.config_ids = {c.name: c.config_id for c in catalog.llm_configs.values()}
+        self.config_ids.update({c.config_id: c.config_id for c in catalog.llm_configs.values()})
+        self.criteria_ids = {c.name: c.criteria_id for c in catalog.criteria.values()}
+        self.criteria_ids.update({c.criteria_id: c.criteria_id for c in catalog.criteria.values()})
+
+    @classmethod
+    def from_session(cls, session: Session, catalog: Catalog) -> "DebateImporter":
+        rows = session.execute(
+            select(User.email, User.user_id, User.llm_config_id).where(User.email.is_not(None))
+        ).all()
+        return cls(catalog, {email: (user_id, config_id) for email, user_id, config_id in rows})
+
+    def _format(self, record: dict):
+        key = _require(record, "format")
+        debate_format = self.catalog.formats.get(key) or self.catalog.format_by_name(key)
+        if debate_format is None:
+            raise ImportValidationError(f"Unknown debate format {key!r}")
+        return debate_format
+
+    def _user(self, person: dict, batch: _Batch, new_users: dict, now: datetime.datetime) -> tuple[str, str | None]:
+        email = _optional(person, "email", str, "participant")
+        if email and email in self.users_by_email:
+            return self.users_by_email[email]
+        if email and email in batch.users_by_email:
+            return batch.users_by_email[email]
+        if email and email in new_users:
+            row = new_users[email]
+            return row["user_id"], row["llm_config_id"]
+        config = _optional(person, "llm_config", str, "participant")
+        config_id = self.config_ids.get(config) if config else None
+        if config and config_id is None:
+            raise ImportValidationError(f"Unknown LLM config {config!r}")
+        row = {
+            "user_id": generate_uuid(),
+            "username": _require(person, "username", "participant"),
+            "email": email,
+            "is_llm": bool(person.get("is_llm", config_id is not None)),
+            "llm_config_id": config_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        new_users[email or row["user_id"]] = row
+        return row["user_id"], config_id
+
+    def add(self, batch: _Batch, record: dict):
+        """Validate one debate and append its rows to ``batch``; all or nothing."""
+        now = datetime.datetime.utcnow()
+        debate_format = self._format(record)
+        phases = {p.name for p in debate_format.phases}
+        debate_id = _optional(record, "debate_id", str) or generate_uuid()
+        created_at = _timestamp(record.get("created_at"), now)
+        completed_at = _timestamp(record.get("completed_at"), None)
+        status = _optional(record, "status", str) or (COMPLETED if completed_at else PENDING)
+        if status not in STATUSES:
+            raise ImportValidationError(f"status must be one of {', '.join(STATUSES)}")
+
+        new_users: dict[str, dict] = {}
+        participants: dict[str, dict] = {}
+        llm_config_ids: dict[str, str] = {}
+        moderator_id = None
+        for person in _objects(record, "participants"):
+            key = _require(person, "key", "participant")
+            side = _require(person, "side", f"participant {key}")
+            if side not in SIDES:
+                raise ImportValidationError(f"participant {key}: unknown side {side!r}")
+            if key in participants:
+                raise ImportValidationError(f"participant {key}: duplicate key")
+            user_id, config_id = self._user(person, batch, new_users, now)
+            participant_id = generate_uuid()
+            participants[key] = {
+                "participant_id": participant_id,
+                "debate_id": debate_id,
+                "user_id": user_id,
+                "side": side,
+                "joined_at": _timestamp(person.get("joined_at"), created_at),
+                "left_at": _timestamp(person.get("left_at"), None),
+            }
+            if config_id is not None:
+                llm_config_ids[participant_id] = config_id
+            if side == "moderator":
+                moderator_id = user_id
+        if moderator_id is None:
+            moderator_email = _optional(record, "moderator_email", str)
+            known = self.users_by_email.get(moderator_email) or batch.users_by_email.get(moderator_email)
+            if known is None:
+                raise ImportValidationError("A 'moderator' participant or a known 'moderator_email' is required")
+            moderator_id = known[0]
+
+        turns, turn_ids = [], {}
+        for position, turn in enumerate(_objects(record, "turns"), start=1):
+            where = f"turn {position}"
+            key = _require(turn, "participant", where)
+            if key not in participants:
+                raise ImportValidationError(f"{where}: unknown participant {key!r}")
+            phase = _require(turn, "phase", where)
+            if phase not in phases:
+                raise ImportValidationError(f"{where}: phase {phase!r} is not in {debate_format.name}")
+            number = turn.get("turn_number", position)
+            if not isinstance(number, int) or isinstance(number, bool) or number < 1 or number in turn_ids:
+                raise ImportValidationError(f"{where}: turn_number must be a unique positive integer")
+            turn_ids[number] = generate_uuid()
+            turns.append({
+                "turn_id": turn_ids[number],
+                "debate_id": debate_id,
+                "participant_id": participants[key]["participant_id"],
+                "content": _require(turn, "content", where),
+                "turn_number": number,
+                "phase": phase,
+                "timestamp": _timestamp(turn.get("timestamp"), created_at),
+                "tokens_used": _optional(turn, "tokens_used", int, where),
+            })
+        turns.sort(key=lambda t: t["turn_number"])
+        if turns and status == PENDING:
+            # Starting the debate resets its phase, so these turns would be replayed
+            raise ImportValidationError(f"A {PENDING} debate cannot have turns")
+
+        sides = {p["participant_id"]: p["side"] for p in participants.values()}
+        if status != COMPLETED:
+            # Turns will continue through append_turn, so the history must be
+            # one it would have accepted. Completed debates are kept as
+            # recorded (a phase deadline may have skipped a phase).
+            current_phase, phase_turn_count, last_side = None, 0, None
+            for turn in turns:
+                side = sides[turn["participant_id"]]
+                try:
+                    phase_turn_count = validate_turn(
+                        debate_format, turn["phase"], side, current_phase, phase_turn_count, last_side
+                    )
+                except TurnOrderError as exc:
+                    raise ImportValidationError(f"turn {turn['turn_number']}: {exc}")
+                current_phase, last_side = turn["phase"], side
+
+        comments = []
+        for position, comment in enumerate(_objects(record, "comments"), start=1):
+            number = _optional(comment, "turn_number", int, f"comment {position}")
+            if number is not None and number not in turn_ids:
+                raise ImportValidationError(f"comment {position}: no turn {number}")
+            comment_type = _optional(comment, "comment_type", str, f"comment {position}") or COMMENTARY
+            if comment_type not in COMMENT_TYPES:
+                raise ImportValidationError(
+                    f"comment {position}: comment_type must be one of {', '.join(COMMENT_TYPES)}"
+                )
+            comments.append({
+                "comment_id": generate_uuid(),
+                "debate_id": debate_id,
+                "turn_id": turn_ids.get(number),
+                "content": _require(comment, "content", f"comment {position}"),
+                "comment_type": comment_type,
+                "timestamp": _timestamp(comment.get("timestamp"), created_at),
+            })
+
+        scores, criteria_scores = [], []
+        judged = set()
+        for position, score in enumerate(_objects(record, "scores"), start=1):
+            where = f"score {position}"
+            judge = _require(score, "judge", where)
+            if judge not in participants or participants[judge]["side"] != "judge":
+                raise ImportValidationError(f"{where}: {judge!r} is not a judge participant")
+            if judge in judged:
+                raise ImportValidationError(f"{where}: judge {judge!r} scored twice")
+            judged.add(judge)
+            winner_side = _optional(score, "winner_side", str, where)
+            if winner_side is not None and winner_side not in WINNER_SIDES:
+                raise ImportValidationError(f"{where}: winner_side must be one of {', '.join(WINNER_SIDES)}")
+            score_id = generate_uuid()
+            scored_at = _timestamp(score.get("created_at"), completed_at or created_at)
+            scores.append({
+                "score_id": score_id,
+                "debate_id": debate_id,
+                "judge_id": participants[judge]["participant_id"],
+                "verdict_summary": _optional(score, "verdict_summary", str, where),
+                "winner_side": winner_side,
+                "created_at": scored_at,
+                "updated_at": scored_at,
+            })
+            for criteria, value in (_optional(score, "criteria", dict, where) or {}).items():
+                criteria_id = self.criteria_ids.get(criteria)
+                if criteria_id is None:
+                    raise ImportValidationError(f"{where}: unknown criteria {criteria!r}")
+                max_score = self.catalog.criteria[criteria_id].max_score
+                if not isinstance(value, int) or not 0 <= value <= max_score:
+                    raise ImportValidationError(f"{where}: {criteria} must be an integer from 0 to {max_score}")
+                criteria_scores.append({
+                    "criteria_score_id": generate_uuid(),
+                    "score_id": score_id,
+                    "criteria_id": criteria_id,
+                    "score_value": value,
+                    "comment": None,
+                })
+
+        # Leave the debate's turn-order state where append_turn would have
+        last = turns[-1] if turns else None
+        current_phase_turns = [t for t in turns if last and t["phase"] == last["phase"]]
+        batch.debates.append({
+            "debate_id": debate_id,
+            "title": _require(record, "title"),
+            "description": _optional(record, "description", str),
+            "proposition": _require(record, "proposition"),
+            "format_id": debate_format.format_id,
+            "status": status,
+            "moderator_id": moderator_id,
+            "time_limit_minutes": _optional(record, "time_limit_minutes", int),
+            "next_turn_number": last["turn_number"] + 1 if last else 1,
+            "current_phase": last["phase"] if last else None,
+            "phase_turn_count": len(current_phase_turns),
+            "last_side": sides[last["participant_id"]] if last else None,
+            "started_at": _timestamp(record.get("started_at"), turns[0]["timestamp"] if turns else None),
+            "phase_started_at": current_phase_turns[0]["timestamp"] if current_phase_turns else None,
+            "created_at": created_at,
+            "updated_at": completed_at or created_at,
+            "completed_at": completed_at,
+            # Imported debates arrive with their comments and scores already written
+            "settled_at": (completed_at or created_at) if status == COMPLETED else None,
+        })
+        batch.users.extend(new_users.values())
+        # Visible to later debates in this batch now, to later batches only
+        # once this one commits (see _record_batch)
+        for row in new_users.values():
+            if row["email"]:
+                batch.users_by_email[row["email"]] = (row["user_id"], row["llm_config_id"])
+        batch.participants.extend(participants.values())
+        batch.turns.extend(turns)
+        batch.comments.extend(comments)
+        batch.scores.extend(scores)
+        batch.criteria_scores.extend(criteria_scores)
+        batch.llm_config_ids.update(llm_config_ids)
+
+
+def write_batch(batch: _Batch, session: Session) -> int:
+    """Insert a batch with one executemany per table; returns rows written."""
+    connection = session.connection()
+    for model, rows in (
+        (User, batch.users),
+        (Debate, batch.debates),
+        (DebateParticipant, batch.participants),
+        (DebateTurn, batch.turns),
+        (ModeratorComment, batch.comments),
+        (DebateScore, batch.scores),
+        (CriteriaScore, batch.criteria_scores),
+    ):
+        if rows:
+            connection.execute(insert(model.__table__), rows)
+    record_bulk_usage(connection, batch.turns, batch.llm_config_ids)
+    return batch.row_count()
+
+
+def parse_lines(importer: DebateImporter, lines: Iterable[bytes | str], report: ImportReport,
+                batch_size: int = BATCH_SIZE, first_line: int = 1):
+    """Yield validated batches from NDJSON lines, recording bad lines in ``report``."""
+    batch = _Batch()
+    for line_number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+            if not isinstance(record, dict):
+                raise ImportValidationError("Each line must be a JSON object")
+            importer.add(batch, record)
+        except (orjson.JSONDecodeError, ImportValidationError) as exc:
+            report.errors.append({"line": line_number, "error": str(exc)})
+            continue
+        batch.line_numbers.append(line_number)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = _Batch()
+    if len(batch):
+        yield batch
+
+
+def _record_batch(report: ImportReport, importer: DebateImporter, batch: _Batch, written: int | Exception):
+    if isinstance(written, Exception):
+        # e.g. a debate_id or email that already exists; the whole batch rolled back
+        for line_number in batch.line_numbers:
+            report.errors.append({"line": line_number, "error": f"batch rolled back: {written}"})
+        return
+    importer.users_by_email.update(batch.users_by_email)
+    report.rows += written
+    report.debates += len(batch)
+
+
+def import_ndjson(lines: Iterable[bytes | str], catalog: Catalog, batch_size: int = BATCH_SIZE) -> ImportReport:
+    """Synchronous import used by the CLI; each batch is one transaction."""
+    report = ImportReport()
+    started = time.perf_counter()
+    with SessionLocal() as session:
+        importer = DebateImporter.from_session(session, catalog)
+    for batch in parse_lines(importer, lines, report, batch_size):
+        try:
+            written = write(partial(write_batch, batch))
+        except IntegrityError as exc:
+            written = exc
+        _record_batch(report, importer, batch, written)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+async def import_stream(chunks: AsyncIterator[bytes], catalog: Catalog, batch_size: int = BATCH_SIZE) -> ImportReport:
+    """Import an NDJSON request body without holding it all in memory."""
+    report = ImportReport()
+    started = time.perf_counter()
+
+    def load_importer():
+        with SessionLocal() as session:
+            return DebateImporter.from_session(session, catalog)
+
+    importer = await asyncio.to_thread(load_importer)
+    pending, lines, next_line = b"", [], 1
+
+    async def flush():
+        nonlocal lines, next_line
+        # Validation is CPU-bound; keep it off the event loop. Batches are
+        # validated one at a time so each sees the users the previous one wrote.
+        batches = parse_lines(importer, lines, report, batch_size, first_line=next_line)
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            try:
+                written = await write_async(partial(write_batch, batch))
+            except IntegrityError as exc:
+                written = exc
+            _record_batch(report, importer, batch, written)
+        next_line += len(lines)
+        lines = []
+
+    async for chunk in chunks:
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        lines.extend(complete)
+        if len(lines) >= batch_size:
+            await flush()
+    if pending.strip():
+        lines.append(pending)
+    if lines:
+        await flush()
+    report.seconds = time.perf_counter() - started
+    return report
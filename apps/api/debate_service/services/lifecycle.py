@@ -0,0 +1,89 @@
+# apps/api/debate_service/services/lifecycle.py
+#
+# Debate status transitions. Each one is a single compare-and-set UPDATE on
+# the debate's primary key, so a stale deadline or a race with a turn append
+# simply matches no row.
+import datetime
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from debate_service.models.schema import Debate
+from debate_service.services.catalog import FormatInfo
+
+PENDING = "pending"
+ACTIVE = "active"
+COMPLETED = "completed"
+
+
+def start_debate(session: Session, debate_id: str, debate_format: FormatInfo) -> datetime.datetime | None:
+    """Activate a debate and open its first phase; returns the start time, or None if not startable."""
+    now = datetime.datetime.utcnow()
+    first_phase = debate_format.phases[0].name if debate_format.phases else None
+    result = session.execute(
+        update(Debate)
+        .where(Debate.debate_id == debate_id, Debate.status == PENDING)
+        .values(
+            status=ACTIVE,
+            started_at=now,
+            current_phase=first_phase,
+            phase_turn_count=0,
+            phase_started_at=now,
+        )
+    )
+    return now if result.rowcount else None
+
+
+def complete_debate(session: Session, debate_id: str) -> bool:
+    now = datetime.datetime.utcnow()
+    result = session.execute(
+        update(Debate)
+        .where(Debate.debate_id == debate_id, Debate.status == ACTIVE)
+        .values(status=COMPLETED, completed_at=now)
+    )
+    return bool(result.rowcount)
+
+
+def settle_debate(session: Session, debate_id: str) -> bool:
+    """Mark a completed debate as final once its comments and scores are in."""
+    result = session.execute(
+        update(Debate)
+        .where(Debate.debate_id == debate_id, Debate.status == COMPLETED, Debate.settled_at.is_(None))
+        .values(settled_at=datetime.datetime.utcnow())
+    )
+    return bool(result.rowcount)
+
+
+def expire_phase(
+    session: Session,
+    debate_id: str,
+    debate_format: FormatInfo,
+    phase: str,
+    phase_started_at: datetime.datetime,
+) -> tuple[str | None, datetime.datetime] | None:
+    """Close ``phase`` when its time runs out.
+
+    Moves the debate to the next phase, or completes it after the last one.
+    Returns the (phase, started_at) that is now open, (None, completed_at)
+    when the debate finished, or None when nothing changed.
+    """
+    names = [p.name for p in debate_format.phases]
+    position = names.index(phase) if phase in names else len(names)
+    still_current = (
+        Debate.debate_id == debate_id,
+        Debate.status == ACTIVE,
+        Debate.current_phase == phase,
+        Debate.phase_started_at == phase_started_at,
+    )
+    now = datetime.datetime.utcnow()
+    if position + 1 >= len(names):
+        result = session.execute(update(Debate).where(*still_current).values(status=COMPLETED, completed_at=now))
+        return (None, now) if result.rowcount else None
+
+    next_phase = names[position + 1]
+    result = session.execute(
+        update(Debate)
+        .where(*still_current)
+        .values(current_phase=next_phase, phase_turn_count=0, last_side=None, phase_started_at=now)
+    )
+    return (next_phase, now) if result.rowcount else None
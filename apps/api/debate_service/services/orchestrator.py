@@ -0,0 +1,366 @@
+# apps/api/debate_service/services/orchestrator.py
+#
+# Drives an LLM-vs-LLM debate turn by turn. Within a format the next speaker
+# is known before the current one finishes, so their inputs (LLMMemory load,
+# context assembly, prompt rendering) are prepared speculatively while the
+# current speaker's model call is in flight. When the turn lands, only that
+# turn is applied to the prepared inputs, so the gap between consecutive
+# turns is just the commit plus one string append. Moderator comments are
+# read fresh for every prepared turn.
+#
+# Speculative work is discarded rather than patched when the plan no longer
+# holds: a moderator intervention (so the next speaker is prepared again with
+# it in context), or a TurnOrderError because the deadline scheduler moved
+# the phase on underneath us.
+import asyncio
+import dataclasses
+import datetime
+import json
+import logging
+import os
+from functools import partial
+from typing import Iterator
+
+from sqlalchemy import select
+
+from debate_service import llm, scheduler
+from debate_service.db import SessionLocal
+from debate_service.db_writer import write_async
+from debate_service.fanout import hub
+from debate_service.models.schema import (Debate, DebateParticipant,
+                                          DebateTurn, LLMMemory,
+                                          ModeratorComment, User)
+from debate_service.services import background, lifecycle, prompts
+from debate_service.services.catalog import (Catalog, FormatInfo,
+                                             LLMConfigInfo, get_catalog)
+from debate_service.services.turns import (DEBATER_SIDES, TurnOrderError,
+                                           commit_turn, phase_side)
+
+logger = logging.getLogger(__name__)
+
+POSITIONS = {"affirmative": "for", "negative": "against"}
+MODERATOR_NOTES = 8
+# Turns a debate may reach unattended when its format has a phase without a
+# turn_limit; such a phase would otherwise alternate speakers forever
+MAX_OPEN_TURNS = int(os.getenv("DEBATE_MAX_OPEN_TURNS", "20"))
+
+_running: dict[str, "DebateOrchestrator"] = {}
+_launched: set[asyncio.Task] = set()
+
+
+async def start_debate(debate_id: str, catalog: Catalog | None = None) -> datetime.datetime | None:
+    """Activate a pending debate and register its deadlines; returns the start time, or None."""
+    catalog = catalog or get_catalog()
+
+    def op(session):
+        row = session.execute(
+            select(Debate.format_id, Debate.time_limit_minutes).where(Debate.debate_id == debate_id)
+        ).one_or_none()
+        if row is None or row.format_id not in catalog.formats:
+            return None
+        started_at = lifecycle.start_debate(session, debate_id, catalog.formats[row.format_id])
+        return (row.format_id, row.time_limit_minutes, started_at) if started_at else None
+
+    started = await write_async(op)
+    if started is None:
+        return None
+    format_id, time_limit_minutes, started_at = started
+    deadlines = scheduler.current()
+    if deadlines is not None:
+        deadlines.debate_started(debate_id, format_id, started_at, time_limit_minutes)
+    hub.publish(debate_id, {"type": "status", "debate_id": debate_id, "status": lifecycle.ACTIVE})
+    return started_at
+
+
+def turn_plan(
+    debate_format: FormatInfo,
+    current_phase: str | None,
+    phase_turn_count: int,
+    last_side: str | None,
+) -> Iterator[tuple[str, str]]:
+    """Yield the (phase, side) of every remaining turn, resuming from the debate's state.
+
+    Phases without a turn_limit alternate sides indefinitely; callers bound
+    the run with max_turns.
+    """
+    names = [p.name for p in debate_format.phases]
+    start = names.index(current_phase) if current_phase in names else 0
+    taken = phase_turn_count if current_phase in names else 0
+    for phase_info in debate_format.phases[start:]:
+        owner = phase_side(phase_info.name)
+        remaining = None if phase_info.turn_limit is None else phase_info.turn_limit - taken
+        taken = 0
+        while remaining is None or remaining > 0:
+            if owner is not None:
+                side = owner
+            else:
+                side = "negative" if last_side == "affirmative" else "affirmative"
+            yield phase_info.name, side
+            last_side = side
+            if remaining is not None:
+                remaining -= 1
+
+
+@dataclasses.dataclass(frozen=True)
+class TurnInputs:
+    participant_id: str
+    side: str
+    phase: str
+    config: LLMConfigInfo
+    system_prompt: str
+    transcript: tuple[str, ...]
+    moderator_notes: str
+    instruction: str
+
+    def messages(self) -> list[tuple[str, str]]:
+        notes = [f"Moderator comments:\n{self.moderator_notes}"] if self.moderator_notes else []
+        return [
+            ("system", self.system_prompt),
+            ("human", "\n\n".join([*self.transcript, *notes, self.instruction])),
+        ]
+
+    def with_turn(self, line: str) -> "TurnInputs":
+        """Apply the delta from a turn that finished after these inputs were prepared."""
+        return dataclasses.replace(self, transcript=(*self.transcript, line))
+
+
+class DebateOrchestrator:
+    def __init__(self, debate_id: str, catalog: Catalog | None = None):
+        self.debate_id = debate_id
+        self.catalog = catalog or get_catalog()
+        self._speculative: asyncio.Task | None = None
+        self._interrupted = False
+        self._exhausted = False
+
+    # State loading (runs in a worker thread)
+
+    def _load(self):
+        with SessionLocal() as session:
+            debate = session.get(Debate, self.debate_id)
+            if debate is None:
+                raise LookupError(f"Debate {self.debate_id} not found")
+            speakers = {}
+            rows = session.execute(
+                select(DebateParticipant.participant_id, DebateParticipant.side, User.llm_config_id)
+                .join(User, User.user_id == DebateParticipant.user_id)
+                .where(
+                    DebateParticipant.debate_id == self.debate_id,
+                    DebateParticipant.side.in_(DEBATER_SIDES),
+                    DebateParticipant.left_at.is_(None),
+                )
+            ).all()
+            for participant_id, side, config_id in rows:
+                speakers.setdefault(side, (participant_id, config_id))
+            turns = session.execute(
+                select(DebateTurn).where(DebateTurn.debate_id == self.debate_id).order_by(DebateTurn.turn_number)
+            ).scalars().all()
+            sides = {participant_id: side for participant_id, side, _ in rows}
+            transcript = tuple(prompts.transcript([turn], sides) for turn in turns)
+            return {
+                "status": debate.status,
+                "proposition": debate.proposition,
+                "format_id": debate.format_id,
+                "current_phase": debate.current_phase,
+                "phase_turn_count": debate.phase_turn_count,
+                "last_side": debate.last_side,
+                "speakers": speakers,
+                "transcript": transcript,
+            }
+
+    def _load_speaker_context(self, participant_id: str) -> tuple[dict[str, str], str]:
+        with SessionLocal() as session:
+            memories = dict(session.execute(
+                select(LLMMemory.memory_key, LLMMemory.memory_value).where(
+                    LLMMemory.participant_id == participant_id,
+                    LLMMemory.debate_id == self.debate_id,
+                )
+            ).all())
+            comments = session.execute(
+                select(ModeratorComment)
+                .where(ModeratorComment.debate_id == self.debate_id)
+                .order_by(ModeratorComment.timestamp.desc())
+                .limit(MODERATOR_NOTES)
+            ).scalars().all()
+            return memories, prompts.comments(reversed(comments))
+
+    # Turn preparation
+
+    async def prepare(self, phase: str, side: str, transcript: tuple[str, ...]) -> TurnInputs:
+        participant_id, config_id = self._state["speakers"][side]
+        config = self.catalog.llm_configs.get(config_id) if config_id else None
+        if config is None:
+            raise LookupError(f"The {side} speaker of debate {self.debate_id} has no LLM config")
+        memories, moderator_notes = await asyncio.to_thread(self._load_speaker_context, participant_id)
+        phase_info = self._format.phase(phase)
+        position = POSITIONS[side]
+        context = "\n".join(f"{key}: {value}" for key, value in sorted(memories.items()))
+        system_prompt = prompts.render(
+            config.base_prompt,
+            proposition=self._state["proposition"],
+            role="DEBATER",
+            position=position,
+            context=context or "No notes yet.",
+        )
+        instruction = prompts.render(phase_info.prompt_template or "", position=position)
+        return TurnInputs(
+            participant_id=participant_id,
+            side=side,
+            phase=phase,
+            config=config,
+            system_prompt=system_prompt,
+            transcript=transcript,
+            moderator_notes=moderator_notes,
+            instruction=f"Current phase: {phase}. {instruction}".strip(),
+        )
+
+    def intervene(self):
+        """Moderator stepped in: drop the speculative next turn and re-plan after the current one."""
+        self._interrupted = True
+        if self._speculative is not None:
+            self._speculative.cancel()
+
+    def _cancel_speculation(self):
+        if self._speculative is not None:
+            self._speculative.cancel()
+            self._speculative = None
+
+    async def _generate(self, inputs: TurnInputs) -> tuple[str, int | None]:
+        reply = await llm.init_chat_model(inputs.config).ainvoke(inputs.messages())
+        usage = getattr(reply, "usage_metadata", None) or {}
+        return reply.content, usage.get("total_tokens")
+
+    async def _commit(self, inputs: TurnInputs, content: str, tokens_used: int | None) -> DebateTurn:
+        turn = await commit_turn(
+            self.debate_id, inputs.participant_id, inputs.phase, content,
+            tokens_used=tokens_used, catalog=self.catalog,
+        )
+        # The scheduler and task runner only exist inside the API process
+        deadlines = scheduler.current()
+        if deadlines is not None:
+            deadlines.turn_appended(self.debate_id, self._format.format_id, turn.phase, turn.timestamp)
+        await background.after_turn(self.debate_id, turn.turn_id, checkpoint_data=json.dumps({
+            "turn_number": turn.turn_number,
+            "phase": turn.phase,
+            "side": inputs.side,
+            "tokens_used": tokens_used,
+        }))
+        return turn
+
+    async def _start(self) -> tuple[Iterator[tuple[str, str]], TurnInputs | None]:
+        while True:
+            # An intervention landing while we load and prepare may have missed both
+            self._interrupted = False
+            self._state = await asyncio.to_thread(self._load)
+            self._format = self.catalog.formats[self._state["format_id"]]
+            plan = turn_plan(
+                self._format,
+                self._state["current_phase"],
+                self._state["phase_turn_count"],
+                self._state["last_side"],
+            )
+            step = next(plan, None)
+            self._exhausted = step is None
+            if step is None or self._state["status"] != lifecycle.ACTIVE:
+                return plan, None
+            current = await self.prepare(*step, self._state["transcript"])
+            if not self._interrupted:
+                return plan, current
+
+    def _position(self) -> tuple:
+        return tuple(self._state[k] for k in ("status", "current_phase", "phase_turn_count", "last_side"))
+
+    async def run(self, max_turns: int | None = None) -> int:
+        """Run turns until the format is exhausted or ``max_turns``; returns turns taken."""
+        if _running.setdefault(self.debate_id, self) is not self:
+            raise RuntimeError(f"Debate {self.debate_id} is already being run")
+        try:
+            return await self._run(max_turns)
+        finally:
+            del _running[self.debate_id]
+
+    async def _run(self, max_turns: int | None) -> int:
+        plan, current = await self._start()
+        if self._state["status"] == lifecycle.PENDING and await start_debate(self.debate_id, self.catalog):
+            plan, current = await self._start()
+        if max_turns is None and any(p.turn_limit is None for p in self._format.phases):
+            max_turns = max(MAX_OPEN_TURNS - len(self._state["transcript"]), 0)
+        taken = 0
+        while current is not None and (max_turns is None or taken < max_turns):
+            generation = asyncio.create_task(self._generate(current))
+
+            step = next(plan, None)
+            self._exhausted = step is None
+            if step is not None and (max_turns is None or taken + 1 < max_turns):
+                # Prepare the next speaker from the transcript as it stands now;
+                # an intervention from here on invalidates what this prepares
+                self._interrupted = False
+                self._speculative = asyncio.create_task(self.prepare(*step, current.transcript))
+
+            try:
+                content, tokens_used = await generation
+                turn = await self._commit(current, content, tokens_used)
+            except TurnOrderError as exc:
+                self._cancel_speculation()
+                before = self._position()
+                plan, current = await self._start()
+                if self._position() == before:
+                    # Nothing moved underneath us, so re-planning would repeat the same turn
+                    raise
+                logger.info("Debate %s re-planning after %s", self.debate_id, exc)
+                continue
+            except BaseException:
+                self._cancel_speculation()
+                raise
+            taken += 1
+
+            speculative, self._speculative = self._speculative, None
+            if speculative is None:
+                current = None
+            elif self._interrupted or speculative.cancelled():
+                plan, current = await self._start()
+            else:
+                line = prompts.transcript([turn], {current.participant_id: current.side})
+                current = (await speculative).with_turn(line)
+                if self._interrupted:
+                    # The intervention arrived while we awaited the prepared turn
+                    plan, current = await self._start()
+
+        if current is None and self._exhausted and self._format.structure == "strict":
+            if await write_async(partial(lifecycle.complete_debate, debate_id=self.debate_id)):
+                hub.publish(self.debate_id, {"type": "status", "debate_id": self.debate_id, "status": lifecycle.COMPLETED})
+                hub.forget(self.debate_id)
+                deadlines = scheduler.current()
+                if deadlines is not None:
+                    deadlines.cancel(self.debate_id)
+                await background.after_completion(self.debate_id)
+        return taken
+
+
+def intervene(debate_id: str) -> bool:
+    """Tell the orchestrator running ``debate_id`` in this process that the moderator stepped in."""
+    orchestrator = _running.get(debate_id)
+    if orchestrator is None:
+        return False
+    orchestrator.intervene()
+    return True
+
+
+def launch(debate_id: str, max_turns: int | None = None) -> asyncio.Task:
+    """Run a debate's orchestrator in the background of the current event loop."""
+    runner = asyncio.create_task(DebateOrchestrator(debate_id).run(max_turns), name=f"debate-{debate_id}")
+    _launched.add(runner)
+
+    def done(task: asyncio.Task):
+        _launched.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Debate %s stopped", debate_id, exc_info=task.exception())
+
+    runner.add_done_callback(done)
+    return runner
+
+
+async def stop_orchestrators():
+    """Cancel every launched debate; each resumes from its stored turn state when launched again."""
+    for runner in list(_launched):
+        runner.cancel()
+    await asyncio.gather(*_launched, return_exceptions=True)
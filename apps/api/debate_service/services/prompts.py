@@ -0,0 +1,22 @@
+# apps/api/debate_service/services/prompts.py
+import re
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+def render(template: str, **values) -> str:
+    """Fill the ``{{name}}`` placeholders used by the seeded prompts; unknown ones are left as-is."""
+    return _PLACEHOLDER.sub(lambda m: str(values.get(m.group(1), m.group(0))), template)
+
+
+def transcript(turns, sides: dict[str, str]) -> str:
+    """Render turns as plain text for prompt context; ``sides`` maps participant_id to side."""
+    return "\n\n".join(
+        f"[{turn.turn_number}] {sides.get(turn.participant_id, 'unknown')} ({turn.phase}): {turn.content}"
+        for turn in turns
+    )
+
+
+def comments(comments) -> str:
+    """Render moderator comments as plain text for prompt context."""
+    return "\n".join(f"- {comment.comment_type}: {comment.content}" for comment in comments)
@@ -0,0 +1,165 @@
+# apps/api/debate_service/services/turns.py
+#
+# Turn appends without MAX(turn_number)+1 races. The debate row carries the
+# next turn number plus the phase/side state, and the first statement of the
+# append is an UPDATE ... RETURNING on that row. That takes SQLite's write
+# lock before anything is read, so concurrent appends to the same debate
+# queue on the lock rather than colliding on unique_turn_number. The
+# transaction stays short and no retry loop is needed. An out-of-order turn
+# raises TurnOrderError and the caller's rollback undoes the increment.
+import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from debate_service.db_writer import write_async
+from debate_service.fanout import hub
+from debate_service.models.schema import (Debate, DebateParticipant,
+                                          DebateTurn, User)
+from debate_service.services.catalog import Catalog, FormatInfo, get_catalog
+from debate_service.services.lifecycle import ACTIVE
+from debate_service.services.usage import record_turn_usage
+
+DEBATER_SIDES = ("affirmative", "negative")
+
+
+class TurnOrderError(ValueError):
+    pass
+
+
+def phase_side(phase_name: str) -> str | None:
+    """Side that owns a phase (e.g. 'opening_pro', 'negative_rebuttal'), or None if shared."""
+    parts = phase_name.split("_")
+    if "pro" in parts or "affirmative" in parts:
+        return "affirmative"
+    if "con" in parts or "negative" in parts:
+        return "negative"
+    return None
+
+
+def validate_turn(
+    debate_format: FormatInfo,
+    phase: str,
+    side: str,
+    current_phase: str | None,
+    phase_turn_count: int,
+    last_side: str | None,
+) -> int:
+    """Check a turn against the format and return the new phase_turn_count."""
+    phase_info = debate_format.phase(phase)
+    if phase_info is None:
+        raise TurnOrderError(f"Phase '{phase}' is not part of format '{debate_format.name}'")
+    staying = phase == current_phase
+    if debate_format.structure != "strict":
+        return phase_turn_count + 1 if staying else 1
+
+    if side not in DEBATER_SIDES:
+        raise TurnOrderError(f"Only debaters take turns in '{debate_format.name}', not '{side}'")
+
+    if staying:
+        if phase_info.turn_limit is not None and phase_turn_count >= phase_info.turn_limit:
+            raise TurnOrderError(f"Phase '{phase}' is limited to {phase_info.turn_limit} turn(s)")
+    else:
+        if current_phase is not None and phase_turn_count == 0:
+            raise TurnOrderError(f"Phase '{current_phase}' has not had a turn yet")
+        expected_index = 0
+        if current_phase is not None:
+            current = debate_format.phase(current_phase)
+            expected_index = debate_format.phases.index(current) + 1 if current else 0
+        expected = debate_format.phases[expected_index] if expected_index < len(debate_format.phases) else None
+        if expected is None or expected.name != phase:
+            raise TurnOrderError(
+                f"Phase '{phase}' cannot follow '{current_phase}'"
+                + (f"; expected '{expected.name}'" if expected else "; the format is finished")
+            )
+
+    owner = phase_side(phase)
+    if owner is not None and side != owner:
+        raise TurnOrderError(f"Phase '{phase}' belongs to the {owner} side")
+    if owner is None and staying and side == last_side:
+        raise TurnOrderError(f"The {side} side already spoke; turns alternate in '{phase}'")
+
+    return phase_turn_count + 1 if staying else 1
+
+
+def append_turn(
+    session: Session,
+    debate_id: str,
+    participant_id: str,
+    phase: str,
+    content: str,
+    tokens_used: int | None = None,
+    catalog: Catalog | None = None,
+) -> DebateTurn:
+    """Allocate the next turn number and insert the turn; the caller commits."""
+    catalog = catalog or get_catalog()
+    now = datetime.datetime.utcnow()
+
+    allocated = session.execute(
+        update(Debate)
+        .where(Debate.debate_id == debate_id, Debate.status == ACTIVE)
+        .values(next_turn_number=Debate.next_turn_number + 1, updated_at=now)
+        .returning(
+            Debate.next_turn_number,
+            Debate.format_id,
+            Debate.current_phase,
+            Debate.phase_turn_count,
+            Debate.last_side,
+        )
+    ).one_or_none()
+    if allocated is None:
+        raise TurnOrderError(f"Debate {debate_id} does not exist or is not {ACTIVE}")
+    next_turn_number, format_id, current_phase, phase_turn_count, last_side = allocated
+
+    participant = session.execute(
+        select(DebateParticipant.side, User.llm_config_id)
+        .join(User, User.user_id == DebateParticipant.user_id)
+        .where(
+            DebateParticipant.participant_id == participant_id,
+            DebateParticipant.debate_id == debate_id,
+            DebateParticipant.left_at.is_(None),
+        )
+    ).one_or_none()
+    if participant is None:
+        raise TurnOrderError(f"Participant {participant_id} is not in debate {debate_id}")
+    side, llm_config_id = participant
+
+    debate_format = catalog.formats.get(format_id)
+    if debate_format is None:
+        raise TurnOrderError(f"Unknown debate format {format_id}")
+    new_phase_count = validate_turn(debate_format, phase, side, current_phase, phase_turn_count, last_side)
+
+    state = {"current_phase": phase, "phase_turn_count": new_phase_count, "last_side": side}
+    if phase != current_phase:
+        state["phase_started_at"] = now
+    session.execute(update(Debate).where(Debate.debate_id == debate_id).values(**state))
+    turn = DebateTurn(
+        debate_id=debate_id,
+        participant_id=participant_id,
+        content=content,
+        turn_number=next_turn_number - 1,
+        phase=phase,
+        timestamp=now,
+        tokens_used=tokens_used,
+    )
+    session.add(turn)
+    session.flush()
+    if llm_config_id is not None:
+        record_turn_usage(session, debate_id, llm_config_id, tokens_used, now)
+    return turn
+
+
+async def commit_turn(
+    debate_id: str,
+    participant_id: str,
+    phase: str,
+    content: str,
+    tokens_used: int | None = None,
+    catalog: Catalog | None = None,
+) -> DebateTurn:
+    """Append and commit a turn, then fan it out to spectators."""
+    turn = await write_async(lambda session: append_turn(
+        session, debate_id, participant_id, phase, content, tokens_used=tokens_used, catalog=catalog
+    ))
+    hub.publish_turn(turn)
+    return turn
@@ -0,0 +1,142 @@
+# apps/api/debate_service/services/usage.py
+#
+# Token usage rollups. record_turn_usage() runs inside the turn-append
+# transaction, so the rollups always agree with debate_turns. The read side
+# only touches the rollup tables. Cost is priced at read time from
+# model_pricing, so a price change applies to past usage as well.
+import datetime
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from debate_service.models.schema import (ModelPricing, UsageByDay,
+                                          UsageByDebate)
+from debate_service.services.catalog import Catalog
+
+
+def _increment(table, key_columns: list[str], now: datetime.datetime):
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            "turns": table.turns + stmt.excluded.turns,
+            "tokens_used": table.tokens_used + stmt.excluded.tokens_used,
+            "updated_at": now,
+        },
+    )
+
+
+def record_turn_usage(
+    session: Session,
+    debate_id: str,
+    llm_config_id: str,
+    tokens_used: int | None,
+    timestamp: datetime.datetime,
+):
+    tokens = tokens_used or 0
+    values = {"llm_config_id": llm_config_id, "turns": 1, "tokens_used": tokens, "updated_at": timestamp}
+    session.execute(_increment(UsageByDebate, ["debate_id", "llm_config_id"], timestamp), {**values, "debate_id": debate_id})
+    session.execute(_increment(UsageByDay, ["day", "llm_config_id"], timestamp), {**values, "day": timestamp.date()})
+
+
+def record_bulk_usage(connection, turns: list[dict], llm_config_ids: dict[str, str]):
+    """Fold many turn rows into the rollups with one executemany per table.
+
+    ``llm_config_ids`` maps participant_id to the LLM config behind it.
+    """
+    now = datetime.datetime.utcnow()
+    by_debate = defaultdict(lambda: [0, 0])
+    by_day = defaultdict(lambda: [0, 0])
+    for turn in turns:
+        config_id = llm_config_ids.get(turn["participant_id"])
+        if config_id is None:
+            continue
+        for bucket in (by_debate[(turn["debate_id"], config_id)], by_day[(turn["timestamp"].date(), config_id)]):
+            bucket[0] += 1
+            bucket[1] += turn["tokens_used"] or 0
+    if by_debate:
+        connection.execute(_increment(UsageByDebate, ["debate_id", "llm_config_id"], now), [
+            {"debate_id": d, "llm_config_id": c, "turns": n, "tokens_used": t, "updated_at": now}
+            for (d, c), (n, t) in by_debate.items()
+        ])
+    if by_day:
+        connection.execute(_increment(UsageByDay, ["day", "llm_config_id"], now), [
+            {"day": d, "llm_config_id": c, "turns": n, "tokens_used": t, "updated_at": now}
+            for (d, c), (n, t) in by_day.items()
+        ])
+
+
+def set_price(session: Session, model: str, usd_per_1k_tokens: float):
+    now = datetime.datetime.utcnow()
+    stmt = insert(ModelPricing).values(model=model, usd_per_1k_tokens=usd_per_1k_tokens, updated_at=now)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[ModelPricing.model],
+        set_={"usd_per_1k_tokens": stmt.excluded.usd_per_1k_tokens, "updated_at": now},
+    ))
+
+
+def _prices(session: Session) -> dict[str, float]:
+    return dict(session.execute(select(ModelPricing.model, ModelPricing.usd_per_1k_tokens)).all())
+
+
+def _row(catalog: Catalog, prices: dict[str, float], llm_config_id: str, turns: int, tokens: int, **keys) -> dict:
+    config = catalog.llm_configs.get(llm_config_id)
+    model = config.model if config else None
+    price = prices.get(model)
+    return {
+        **keys,
+        "llm_config_id": llm_config_id,
+        "model": model,
+        "turns": turns,
+        "tokens_used": tokens,
+        "cost_usd": round(tokens / 1000 * price, 6) if price is not None else None,
+    }
+
+
+def usage_by_day(
+    session: Session,
+    catalog: Catalog,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    llm_config_id: str | None = None,
+) -> list[dict]:
+    query = select(UsageByDay).order_by(UsageByDay.day, UsageByDay.llm_config_id)
+    if start is not None:
+        query = query.where(UsageByDay.day >= start)
+    if end is not None:
+        query = query.where(UsageByDay.day <= end)
+    if llm_config_id is not None:
+        query = query.where(UsageByDay.llm_config_id == llm_config_id)
+    prices = _prices(session)
+    return [
+        _row(catalog, prices, r.llm_config_id, r.turns, r.tokens_used, day=r.day)
+        for r in session.execute(query).scalars()
+    ]
+
+
+def usage_for_debate(session: Session, catalog: Catalog, debate_id: str) -> list[dict]:
+    prices = _prices(session)
+    rows = session.execute(
+        select(UsageByDebate).where(UsageByDebate.debate_id == debate_id).order_by(UsageByDebate.llm_config_id)
+    ).scalars()
+    return [_row(catalog, prices, r.llm_config_id, r.turns, r.tokens_used, debate_id=debate_id) for r in rows]
+
+
+def usage_by_model(
+    session: Session,
+    catalog: Catalog,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+) -> list[dict]:
+    totals = defaultdict(lambda: {"turns": 0, "tokens_used": 0, "cost_usd": 0.0})
+    for row in usage_by_day(session, catalog, start, end):
+        bucket = totals[row["model"]]
+        bucket["turns"] += row["turns"]
+        bucket["tokens_used"] += row["tokens_used"]
+        if row["cost_usd"] is None or bucket["cost_usd"] is None:
+            bucket["cost_usd"] = None
+        else:
+            bucket["cost_usd"] = round(bucket["cost_usd"] + row["cost_usd"], 6)
+    return [{"model": model, **bucket} for model, bucket in sorted(totals.items(), key=lambda kv: str(kv[0]))]
@@ -0,0 +1,122 @@
+# apps/api/debate_service/services/writes.py
+#
+# Mutating operations shaped as ``op(session)`` so they can be handed to
+# db_writer.write()/write_async() unchanged, e.g.
+#     await write_async(partial(upsert_memory, participant_id, debate_id, "notes", text))
+import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from debate_service.models.schema import (CriteriaScore, Debate,
+                                          DebateCheckpoint, DebateScore,
+                                          DebateTurn, LLMMemory,
+                                          ModeratorComment, generate_uuid)
+
+COMMENTARY = "commentary"
+INTERVENTION = "intervention"
+COMMENT_TYPES = (COMMENTARY, INTERVENTION)
+WINNER_SIDES = ("affirmative", "negative", "tie")
+
+
+def touch_debate(debate_id: str, session: Session) -> None:
+    """Bump debates.updated_at so transcript/verdict ETags change with comments and scores."""
+    session.execute(
+        update(Debate).where(Debate.debate_id == debate_id).values(updated_at=datetime.datetime.utcnow())
+    )
+
+
+def debate_settled(debate_id: str, session: Session) -> bool:
+    """True once the debate's transcript and verdict are final (served as immutable)."""
+    return session.execute(
+        select(Debate.settled_at.is_not(None)).where(Debate.debate_id == debate_id)
+    ).scalar() or False
+
+
+def turn_has_comment(turn_id: str, session: Session) -> bool:
+    return session.execute(
+        select(ModeratorComment.comment_id).where(ModeratorComment.turn_id == turn_id).limit(1)
+    ).first() is not None
+
+
+def add_comment(debate_id: str, turn_id: str | None, content: str, comment_type: str, session: Session):
+    """Write a moderator comment; returns None without writing once the debate is settled."""
+    row = session.execute(select(Debate.settled_at).where(Debate.debate_id == debate_id)).one_or_none()
+    if row is None:
+        raise LookupError(f"Debate {debate_id} not found")
+    if row.settled_at is not None:
+        return None
+    if turn_id is not None:
+        turn = session.get(DebateTurn, turn_id)
+        if turn is None or turn.debate_id != debate_id:
+            raise LookupError(f"Turn {turn_id} not found in debate {debate_id}")
+    comment = ModeratorComment(debate_id=debate_id, turn_id=turn_id, content=content, comment_type=comment_type)
+    session.add(comment)
+    session.flush()
+    touch_debate(debate_id, session)
+    return comment
+
+
+def upsert_memory(participant_id: str, debate_id: str, key: str, value: str, session: Session) -> None:
+    now = datetime.datetime.utcnow()
+    stmt = insert(LLMMemory).values(
+        memory_id=generate_uuid(),
+        participant_id=participant_id,
+        debate_id=debate_id,
+        memory_key=key,
+        memory_value=value,
+        created_at=now,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LLMMemory.participant_id, LLMMemory.debate_id, LLMMemory.memory_key],
+        set_={"memory_value": stmt.excluded.memory_value, "updated_at": now},
+    )
+    session.execute(stmt)
+
+
+def save_checkpoint(debate_id: str, last_turn_id: str, checkpoint_data: str, session: Session) -> str:
+    """Checkpoint a debate after ``last_turn_id``; a second call for the same turn returns the first."""
+    existing = session.execute(
+        select(DebateCheckpoint.checkpoint_id).where(DebateCheckpoint.last_turn_id == last_turn_id)
+    ).scalar()
+    if existing is not None:
+        return existing
+    checkpoint = DebateCheckpoint(
+        debate_id=debate_id, last_turn_id=last_turn_id, checkpoint_data=checkpoint_data
+    )
+    session.add(checkpoint)
+    session.flush()
+    return checkpoint.checkpoint_id
+
+
+def record_score(
+    debate_id: str,
+    judge_id: str,
+    winner_side: str | None,
+    verdict_summary: str | None,
+    criteria_scores: dict[str, int],
+    session: Session,
+) -> str | None:
+    """Write a judge's verdict and per-criteria scores; returns the score_id.
+
+    Returns None without writing once the debate is settled.
+    """
+    if debate_settled(debate_id, session):
+        return None
+    score = DebateScore(
+        debate_id=debate_id,
+        judge_id=judge_id,
+        winner_side=winner_side,
+        verdict_summary=verdict_summary,
+    )
+    session.add(score)
+    session.flush()
+    session.add_all(
+        CriteriaScore(score_id=score.score_id, criteria_id=criteria_id, score_value=value)
+        for criteria_id, value in criteria_scores.items()
+    )
+    session.flush()
+    touch_debate(debate_id, session)
+    return score.score_id
@@ -0,0 +1,410 @@
+# apps/api/debate_service/tasks.py
+#
+# In-process background work queue for everything that should not sit on a
+# debater's turn latency: moderator commentary, checkpoints, incremental
+# scoring. A bounded asyncio.PriorityQueue gives backpressure (submit() waits
+# when the queue is full). A fixed pool of worker tasks drains it, and failed
+# tasks are retried with exponential backoff.
+#
+# With DEBATE_TASKS_DURABLE=1 each task is also written to background_tasks
+# and deleted when it succeeds. Every row is claimed by the runner that queued
+# it, and the runner's heartbeat renews its claims. At startup and on every
+# heartbeat, a runner takes over queued rows that are unclaimed (released on
+# a clean stop) or whose claim has expired (the owner died mid-flight). The
+# takeover is a compare-and-set UPDATE, so a live sibling worker's tasks are
+# never queued twice. A task can still run twice when its owner dies after
+# the handler's write but before the row is deleted, so handlers must be
+# idempotent.
+#
+# Tasks are counted per debate_id kwarg while queued, running or waiting to
+# retry, so after_drain() can queue follow-up work once a debate has none.
+import asyncio
+import datetime
+import inspect
+import itertools
+import json
+import logging
+import os
+import socket
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import and_, delete, func, or_, select, update
+
+from debate_service.db import SessionLocal
+from debate_service.db_writer import write_async
+from debate_service.models.schema import BackgroundTask, generate_uuid
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+WORKERS = int(os.getenv("DEBATE_TASK_WORKERS", "4"))
+QUEUE_SIZE = int(os.getenv("DEBATE_TASK_QUEUE_SIZE", "1000"))
+DURABLE = os.getenv("DEBATE_TASKS_DURABLE", "0") == "1"
+LEASE_SECONDS = float(os.getenv("DEBATE_TASK_LEASE_SECONDS", "60"))
+
+_handlers: dict[str, Callable] = {}
+
+
+def task(name: str):
+    """Register a handler under ``name``; sync handlers run in a worker thread."""
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    priority: int
+    seq: int
+    name: str = field(compare=False)
+    kwargs: dict = field(compare=False)
+    max_retries: int = field(compare=False)
+    attempts: int = field(compare=False, default=0)
+    task_id: str | None = field(compare=False, default=None)
+
+
+class TaskRunner:
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        durable: bool = DURABLE,
+        retry_base_delay: float = 0.5,
+        lease_seconds: float = LEASE_SECONDS,
+    ):
+        self.workers = workers
+        self.durable = durable
+        self.retry_base_delay = retry_base_delay
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{generate_uuid()[:8]}"
+        self._heartbeat: asyncio.Task | None = None
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=queue_size)
+        self._seq = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.Task] = set()
+        self._waiting: set[asyncio.Task] = set()
+        self._pending: Counter[str] = Counter()
+        self._after_drain: dict[str, list[tuple[str, int, dict]]] = {}
+
+    async def start(self):
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"task-worker-{i}") for i in range(self.workers)
+        ]
+        if self.durable:
+            await self._restore()
+            self._heartbeat = asyncio.create_task(self._keep_claims(), name="task-heartbeat")
+
+    async def stop(self, timeout: float = 10.0):
+        """Let queued tasks finish (up to ``timeout``), then cancel the workers."""
+        try:
+            # Tasks backing off before a retry still count as unfinished
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping with %d background task(s) still queued and %d waiting to retry",
+                self._queue.qsize(), len(self._retries),
+            )
+        background = [
+            *self._workers, *self._retries, *self._waiting, *([self._heartbeat] if self._heartbeat else []),
+        ]
+        for worker in background:
+            worker.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        if self.durable:
+            # Unfinished rows can be taken over straight away instead of after the lease
+            await self._bookkeep(self._release())
+
+    async def submit(self, name: str, priority: int = PRIORITY_NORMAL, max_retries: int = 3, **kwargs: Any):
+        """Queue ``name(**kwargs)``; waits while the queue is full."""
+        item = self._make(name, priority, max_retries, kwargs)
+        if self.durable:
+            await self._persist(item)
+        await self._queue.put(item)
+        self._track(item)
+        return item.task_id
+
+    def submit_nowait(self, name: str, priority: int = PRIORITY_NORMAL, max_retries: int = 3, **kwargs: Any):
+        """Queue without waiting; raises asyncio.QueueFull instead of blocking.
+
+        Not persisted even in durable mode, so use it for work that may be lost.
+        """
+        item = self._make(name, priority, max_retries, kwargs)
+        self._queue.put_nowait(item)
+        self._track(item)
+        return item.task_id
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def pending(self, debate_id: str) -> int:
+        """Tasks for ``debate_id`` that are queued, running or waiting to retry."""
+        return self._pending[debate_id]
+
+    def after_drain(self, debate_id: str, name: str, priority: int = PRIORITY_NORMAL, **kwargs: Any):
+        """Queue ``name(debate_id=..., **kwargs)`` once no task for ``debate_id`` is pending."""
+        if self._pending[debate_id]:
+            self._after_drain.setdefault(debate_id, []).append((name, priority, kwargs))
+        else:
+            self._submit_soon(name, priority, debate_id, kwargs)
+
+    async def stored_elsewhere(self, debate_id: str) -> bool:
+        """True if another runner holds stored, unfinished tasks for ``debate_id``."""
+        if not self.durable:
+            return False
+
+        def load():
+            with SessionLocal() as session:
+                return session.execute(
+                    select(BackgroundTask.task_id).where(
+                        BackgroundTask.status == "queued",
+                        func.json_extract(BackgroundTask.payload, "$.debate_id") == debate_id,
+                        or_(BackgroundTask.claimed_by.is_(None), BackgroundTask.claimed_by != self.owner),
+                    ).limit(1)
+                ).first() is not None
+
+        return await asyncio.to_thread(load)
+
+    def _submit_soon(self, name: str, priority: int, debate_id: str, kwargs: dict):
+        item = self._make(name, priority, 3, {"debate_id": debate_id, **kwargs})
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Wait for room rather than lose follow-up work such as settling a debate
+            waiting = asyncio.create_task(self._queue.put(item))
+            self._waiting.add(waiting)
+            waiting.add_done_callback(self._waiting.discard)
+        self._track(item)
+
+    def _track(self, item: _QueuedTask):
+        debate_id = item.kwargs.get("debate_id")
+        if debate_id is not None:
+            self._pending[debate_id] += 1
+
+    def _finished(self, item: _QueuedTask):
+        debate_id = item.kwargs.get("debate_id")
+        if debate_id is None:
+            return
+        self._pending[debate_id] -= 1
+        if self._pending[debate_id] > 0:
+            return
+        del self._pending[debate_id]
+        for name, priority, kwargs in self._after_drain.pop(debate_id, []):
+            self._submit_soon(name, priority, debate_id, kwargs)
+
+    def _make(self, name, priority, max_retries, kwargs) -> _QueuedTask:
+        if name not in _handlers:
+            raise KeyError(f"No background task registered as '{name}'")
+        return _QueuedTask(priority, next(self._seq), name, kwargs, max_retries, task_id=generate_uuid())
+
+    async def _work(self):
+        while True:
+            item = await self._queue.get()
+            retrying = False
+            try:
+                retrying = await self._execute(item)
+            except Exception:
+                logger.exception("Background task %s could not be processed", item.name)
+            finally:
+                # A retry keeps its slot until _requeue_later has put it back
+                if not retrying:
+                    self._finished(item)
+                    self._queue.task_done()
+
+    async def _execute(self, item: _QueuedTask) -> bool:
+        """Run one attempt; returns True when a retry has been scheduled."""
+        handler = _handlers[item.name]
+        item.attempts += 1
+        try:
+            if inspect.iscoroutinefunction(handler):
+                await handler(**item.kwargs)
+            else:
+                await asyncio.to_thread(handler, **item.kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if item.attempts > item.max_retries:
+                logger.exception("Background task %s failed after %d attempt(s)", item.name, item.attempts)
+                if self.durable:
+                    await self._bookkeep(self._mark(item, "failed", repr(exc)))
+                return False
+            delay = self.retry_base_delay * 2 ** (item.attempts - 1)
+            logger.warning("Background task %s failed (%r); retrying in %.1fs", item.name, exc, delay)
+            retry = asyncio.create_task(self._requeue_later(item, delay))
+            self._retries.add(retry)
+            retry.add_done_callback(self._retries.discard)
+            if self.durable:
+                await self._bookkeep(self._mark(item, "queued", repr(exc)))
+            return True
+        if self.durable:
+            await self._bookkeep(self._forget(item))
+        return False
+
+    async def _requeue_later(self, item: _QueuedTask, delay: float):
+        try:
+            await asyncio.sleep(delay)
+            await self._queue.put(item)
+        finally:
+            self._queue.task_done()
+
+    async def _bookkeep(self, status_write):
+        # The durable row is bookkeeping; failing to update it must not lose the task
+        try:
+            await status_write
+        except Exception:
+            logger.exception("Could not update the stored state of a background task")
+
+    async def _persist(self, item: _QueuedTask):
+        now = datetime.datetime.utcnow()
+
+        def op(session):
+            session.add(BackgroundTask(
+                task_id=item.task_id,
+                name=item.name,
+                payload=json.dumps(item.kwargs),
+                priority=item.priority,
+                max_retries=item.max_retries,
+                attempts=0,
+                status="queued",
+                claimed_by=self.owner,
+                claimed_at=now,
+                created_at=now,
+                updated_at=now,
+            ))
+
+        await write_async(op)
+
+    async def _mark(self, item: _QueuedTask, status: str, error: str):
+        await write_async(lambda session: session.execute(
+            update(BackgroundTask)
+            .where(BackgroundTask.task_id == item.task_id)
+            .values(status=status, attempts=item.attempts, last_error=error)
+        ))
+
+    async def _forget(self, item: _QueuedTask):
+        await write_async(lambda session: session.execute(
+            delete(BackgroundTask).where(BackgroundTask.task_id == item.task_id)
+        ))
+
+    async def _release(self):
+        await write_async(lambda session: session.execute(
+            update(BackgroundTask)
+            .where(BackgroundTask.claimed_by == self.owner, BackgroundTask.status == "queued")
+            .values(claimed_by=None, claimed_at=None)
+        ))
+
+    async def _keep_claims(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self._bookkeep(write_async(lambda session: session.execute(
+                update(BackgroundTask)
+                .where(BackgroundTask.claimed_by == self.owner)
+                .values(claimed_at=datetime.datetime.utcnow())
+            )))
+            try:
+                await self._restore()
+            except Exception:
+                logger.exception("Could not take over stored background tasks")
+
+    async def _restore(self):
+        """Claim queued rows nobody holds a live lease on and queue them here.
+
+        Claims no more rows than the queue has room for, so queuing them never
+        waits; the rest are left for a later heartbeat or a sibling worker.
+        """
+        room = self._queue.maxsize - self._queue.qsize() if self._queue.maxsize else None
+        if room == 0:
+            return
+        now = datetime.datetime.utcnow()
+        expired = now - datetime.timedelta(seconds=self.lease_seconds)
+        claimable = and_(
+            BackgroundTask.status == "queued",
+            # Rows for handlers this build lacks stay free for a worker that has them
+            BackgroundTask.name.in_(list(_handlers)),
+            or_(
+                BackgroundTask.claimed_by.is_(None),
+                and_(BackgroundTask.claimed_at < expired, BackgroundTask.claimed_by != self.owner),
+            ),
+        )
+        candidates = (
+            select(BackgroundTask.task_id)
+            .where(claimable)
+            .order_by(BackgroundTask.priority, BackgroundTask.created_at)
+            .limit(room)
+        )
+
+        def claim(session):
+            # The WHERE is re-checked by the UPDATE itself, so a sibling's concurrent claim wins cleanly
+            return session.execute(
+                update(BackgroundTask)
+                .where(BackgroundTask.task_id.in_(candidates.scalar_subquery()), claimable)
+                .values(claimed_by=self.owner, claimed_at=now)
+                .returning(
+                    BackgroundTask.task_id,
+                    BackgroundTask.name,
+                    BackgroundTask.payload,
+                    BackgroundTask.priority,
+                    BackgroundTask.max_retries,
+                    BackgroundTask.attempts,
+                    BackgroundTask.created_at,
+                )
+            ).all()
+
+        rows = sorted(await write_async(claim), key=lambda row: (row.priority, row.created_at))
+        unqueued = []
+        for row in rows:
+            item = _QueuedTask(
+                row.priority, next(self._seq), row.name, json.loads(row.payload),
+                row.max_retries, attempts=row.attempts, task_id=row.task_id,
+            )
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # submit() filled the room while we were claiming
+                unqueued.append(row.task_id)
+                continue
+            self._track(item)
+        if unqueued:
+            await write_async(lambda session: session.execute(
+                update(BackgroundTask)
+                .where(BackgroundTask.task_id.in_(unqueued), BackgroundTask.claimed_by == self.owner)
+                .values(claimed_by=None, claimed_at=None)
+            ))
+        if len(rows) > len(unqueued):
+            logger.info("Restored %d background task(s)", len(rows) - len(unqueued))
+
+
+_runner: TaskRunner | None = None
+
+
+def get_runner() -> TaskRunner:
+    if _runner is None:
+        raise RuntimeError("Background task runner is not running")
+    return _runner
+
+
+def current() -> TaskRunner | None:
+    """The running task runner, or None outside the API process (scripts, tests)."""
+    return _runner
+
+
+async def start_runner(**kwargs) -> TaskRunner:
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner(**kwargs)
+        await _runner.start()
+    return _runner
+
+
+async def stop_runner():
+    global _runner
+    if _runner is not None:
+        await _runner.stop()
+        _runner = None
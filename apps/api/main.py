@@ -1,7 +1,61 @@
-# apps/api/main.py
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from debate_service import db, db_writer, scheduler, tasks
+from debate_service.http_client import close_http_client, get_http_client
+from debate_service.routes.debates import router as debates_router
 from debate_service.routes.ping import router as ping_router
+from debate_service.routes.spectate import router as spectate_router
+from debate_service.routes.usage import router as usage_router
+from debate_service.services import background  # noqa: F401  registers task handlers
+from debate_service.services.catalog import get_catalog
+from debate_service.services.orchestrator import stop_orchestrators
 
-app = FastAPI()
-app.include_router(ping_router)
+# Set DEBATE_PREWARM=1 to load the reference catalog, create the HTTP pool the
+# chat models share and import the LLM stack before the worker starts
+# accepting requests.
+PREWARM = os.getenv("DEBATE_PREWARM", "0") == "1"
+# With DEBATE_STORAGE=memory, write the database here on shutdown
+SNAPSHOT_PATH = os.getenv("DEBATE_SNAPSHOT_PATH")
+
+
+async def prewarm():
+    from debate_service import llm
 
+    await run_in_threadpool(get_catalog)
+    await run_in_threadpool(llm.prewarm)
+    get_http_client()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if db.IN_MEMORY:
+        await run_in_threadpool(db.init_memory_database)
+        # Load the catalog now: a first load from inside a session would wait
+        # on the single in-memory connection that session already holds.
+        await run_in_threadpool(get_catalog)
+    if db_writer.ENABLED:
+        # In memory mode the writer shares the one pooled connection
+        db_writer.start_coordinator(db.engine if db.IN_MEMORY else None)
+    if PREWARM:
+        await prewarm()
+    await tasks.start_runner()
+    await scheduler.start_scheduler()
+    yield
+    await stop_orchestrators()
+    await scheduler.stop_scheduler()
+    await tasks.stop_runner()
+    await close_http_client()
+    await run_in_threadpool(db_writer.stop_coordinator)
+    if db.IN_MEMORY and SNAPSHOT_PATH:
+        await run_in_threadpool(db.snapshot_to_disk, SNAPSHOT_PATH)
+
+
+app = FastAPI(lifespan=lifespan)
+app.include_router(ping_router)
+app.include_router(debates_router)
+app.include_router(spectate_router)
+app.include_router(usage_router)
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _run(code: str, env: dict) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=API_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def memory_mode():
+    """Run a snippet in a fresh interpreter with DEBATE_STORAGE=memory; returns its stdout."""
+    return lambda code: _run(code, {"DEBATE_STORAGE": "memory"})
+
+
+@pytest.fixture
+def file_mode(tmp_path):
+    """Like memory_mode, but on an SQLite file so sessions really run concurrently."""
+    env = {"DEBATE_STORAGE": "file", "DATABASE_URL": f"sqlite:///{tmp_path / 'debates.db'}"}
+    return lambda code: _run(code, env)
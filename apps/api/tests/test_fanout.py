@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import orjson
+
+from debate_service.fanout import FanoutHub
+
+
+def turn(n):
+    return {"type": "turn", "debate_id": "d", "turn_number": n}
+
+
+def comment(n):
+    return {"type": "comment", "debate_id": "d", "turn_number": n}
+
+
+def test_late_comment_does_not_hide_an_evicted_turn():
+    hub = FanoutHub(history_size=3)
+    for event in (turn(5), comment(5), turn(6), comment(5)):
+        hub.publish("d", event)
+    # History is now [comment5, turn6, comment5]; turn 5 is gone
+    assert hub._recent("d", 4) is None
+
+
+def test_resume_served_from_history():
+    hub = FanoutHub()
+    for event in (turn(1), turn(2), comment(2), turn(3)):
+        hub.publish("d", event)
+    assert [orjson.loads(p) for _, p in hub._recent("d", 2)] == [comment(2), turn(3)]
+
+
+def test_subscriber_overflowing_during_backlog_load_stays_subscribed():
+    release = threading.Event()
+
+    class SlowHub(FanoutHub):
+        loads = 0
+
+        def _status(self, debate_id):
+            return "active"
+
+        def _load_backlog(self, debate_id, after_turn):
+            self.loads += 1
+            if self.loads == 1:
+                release.wait(5)
+            return []
+
+    async def scenario():
+        hub = SlowHub(subscriber_buffer=2)
+        subscribing = asyncio.create_task(hub.subscribe("d", after_turn=0))
+        await asyncio.sleep(0.05)
+        for n in range(1, 5):
+            hub.publish("other", turn(n))
+            hub.publish("d", {"type": "phase", "debate_id": "d"})
+        release.set()
+        sub = await subscribing
+        hub.publish("d", turn(9))
+        return hub.subscriber_count("d"), await asyncio.wait_for(sub.__anext__(), 1)
+
+    count, (turn_number, _) = asyncio.run(scenario())
+    assert count == 1
+    assert turn_number == 9
+
+
+def test_spectating_a_completed_or_unknown_debate_does_not_hang(memory_mode):
+    out = memory_mode("""
+        import datetime
+        from fastapi.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+        from main import app
+        from debate_service.db import SessionLocal
+        from debate_service.models.schema import Debate, DebateParticipant, DebateTurn, User
+        from debate_service.services.catalog import get_catalog
+
+        with TestClient(app) as client:
+            with SessionLocal() as session:
+                user = User(username="u")
+                session.add(user)
+                session.flush()
+                debate = Debate(title="t", proposition="P", status="completed",
+                                format_id=get_catalog().format_by_name("Oxford Style").format_id,
+                                moderator_id=user.user_id, completed_at=datetime.datetime.utcnow())
+                session.add(debate)
+                session.flush()
+                participant = DebateParticipant(debate_id=debate.debate_id, user_id=user.user_id, side="affirmative")
+                session.add(participant)
+                session.flush()
+                session.add_all(
+                    DebateTurn(debate_id=debate.debate_id, participant_id=participant.participant_id,
+                               content="x", turn_number=n, phase="opening_pro")
+                    for n in (1, 2)
+                )
+                session.commit()
+                debate_id = debate.debate_id
+
+            events = client.get(f"/debates/{debate_id}/events").text.count("data:")
+            resumed = client.get(f"/debates/{debate_id}/events?after=1").text.count("data:")
+            with client.websocket_connect(f"/debates/{debate_id}/ws") as ws:
+                ws.receive_bytes()
+                ws.receive_bytes()
+                try:
+                    ws.receive_bytes()
+                except WebSocketDisconnect as exc:
+                    closed = exc.code
+            missing = client.get("/debates/nope/events").status_code
+            try:
+                with client.websocket_connect("/debates/nope/ws"):
+                    rejected = None
+            except WebSocketDisconnect as exc:
+                rejected = exc.code
+            print(events, resumed, closed, missing, rejected)
+    """)
+    assert out == "2 1 1000 404 1008"
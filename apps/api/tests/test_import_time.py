@@ -0,0 +1,12 @@
+from debate_service.scripts.import_time import DEFAULT_BUDGET_MS, MUST_STAY_LAZY, measure
+
+
+def test_import_main_within_budget():
+    total_ms, _ = measure("main")
+    assert total_ms <= DEFAULT_BUDGET_MS, f"import main took {total_ms:.1f} ms"
+
+
+def test_llm_stack_stays_lazy():
+    _, cumulative = measure("main")
+    eager = sorted(name for name in cumulative if name.split(".")[0] in MUST_STAY_LAZY)
+    assert not eager, f"eagerly imported: {', '.join(eager)}"
@@ -0,0 +1,114 @@
+import orjson
+import pytest
+
+from debate_service.services.catalog import Catalog, CriteriaInfo, FormatInfo, PhaseInfo
+from debate_service.services.importer import DebateImporter, ImportReport, parse_lines
+
+OXFORD = FormatInfo("f1", "Oxford Style", "strict", (
+    PhaseInfo("p1", "f1", "opening_pro", 1, "", 1),
+    PhaseInfo("p2", "f1", "opening_con", 2, "", 1),
+    PhaseInfo("p3", "f1", "cross_examination", 3, "", 3),
+))
+CATALOG = Catalog(formats={"f1": OXFORD}, criteria={"c1": CriteriaInfo("c1", "Clarity", 10, 1.0)})
+
+
+def debate(**overrides):
+    record = {
+        "title": "t",
+        "proposition": "p",
+        "format": "Oxford Style",
+        "status": "completed",
+        "participants": [
+            {"key": "m", "side": "moderator", "username": "mod", "email": "m@example.com"},
+            {"key": "a", "side": "affirmative", "username": "aff"},
+            {"key": "n", "side": "negative", "username": "neg"},
+        ],
+        "turns": [
+            {"participant": "a", "turn_number": 1, "phase": "opening_pro", "content": "x"},
+            {"participant": "n", "turn_number": 2, "phase": "opening_con", "content": "y"},
+        ],
+    }
+    record.update(overrides)
+    return record
+
+
+def parse(*records):
+    report = ImportReport()
+    lines = [orjson.dumps(r) for r in records]
+    batches = list(parse_lines(DebateImporter(CATALOG, {}), lines, report))
+    return batches, report
+
+
+@pytest.mark.parametrize("overrides", [
+    {"participants": "abc"},
+    {"participants": [["not", "a", "dict"]]},
+    {"turns": [{"participant": "a", "turn_number": [1], "phase": "opening_pro", "content": "x"}]},
+    {"turns": [{"participant": "a", "phase": "opening_pro", "content": "x", "tokens_used": "lots"}]},
+    {"turns": ["x"]},
+    {"comments": [{"turn_number": {"n": 1}, "content": "c"}]},
+    {"status": "archived"},
+    {"title": ["t"]},
+    {"scores": [{"judge": "a", "criteria": [1]}]},
+    {"status": "pending"},
+    {"comments": [{"turn_number": 1, "content": "c", "comment_type": "rant"}]},
+])
+def test_wrongly_shaped_lines_are_reported(overrides):
+    batches, report = parse(debate(**overrides))
+    assert batches == []
+    assert [e["line"] for e in report.errors] == [1]
+
+
+@pytest.mark.parametrize("turns", [
+    [{"participant": "n", "turn_number": 1, "phase": "opening_pro", "content": "x"}],
+    [{"participant": "a", "turn_number": 1, "phase": "opening_con", "content": "x"}],
+    [
+        {"participant": "a", "turn_number": 1, "phase": "opening_pro", "content": "x"},
+        {"participant": "a", "turn_number": 2, "phase": "opening_pro", "content": "y"},
+    ],
+])
+def test_active_debates_must_follow_turn_order(turns):
+    batches, report = parse(debate(status="active", turns=turns))
+    assert batches == [] and "turn" in report.errors[0]["error"]
+    # The same history is kept as recorded for a completed debate
+    batches, report = parse(debate(turns=turns))
+    assert len(batches) == 1 and not report.errors
+
+
+def test_winner_side_must_be_a_known_side():
+    judged = debate(participants=[*debate()["participants"], {"key": "j", "side": "judge", "username": "judge"}])
+    batches, report = parse({**judged, "scores": [{"judge": "j", "winner_side": "affirmative"}]})
+    assert len(batches) == 1 and not report.errors
+    batches, report = parse({**judged, "scores": [{"judge": "j", "winner_side": "aff"}]})
+    assert batches == [] and "winner_side" in report.errors[0]["error"]
+
+
+def test_users_from_a_rolled_back_batch_are_not_reused(memory_mode):
+    out = memory_mode("""
+        import orjson
+        from debate_service.db import SessionLocal, init_memory_database
+        from debate_service.models.schema import DebateParticipant, User
+        from debate_service.services.catalog import get_catalog
+        from debate_service.services.importer import import_ndjson
+
+        init_memory_database()
+        def line(debate_id):
+            return orjson.dumps({
+                "debate_id": debate_id, "title": "t", "proposition": "p", "format": "Oxford Style",
+                "status": "completed",
+                "participants": [
+                    {"key": "m", "side": "moderator", "username": "mod", "email": "new@example.com"},
+                    {"key": "a", "side": "affirmative", "username": "aff"},
+                ],
+            })
+        # Batch 1 collides with itself on debate_id and rolls back; batch 2 must recreate the user
+        report = import_ndjson([line("dup"), line("dup"), line("fresh")], get_catalog(), batch_size=2)
+        with SessionLocal() as session:
+            orphans = (
+                session.query(DebateParticipant)
+                .outerjoin(User, User.user_id == DebateParticipant.user_id)
+                .filter(User.user_id.is_(None))
+                .count()
+            )
+        print(report.debates, orphans)
+    """)
+    assert out == "1 0"
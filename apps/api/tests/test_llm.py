@@ -0,0 +1,21 @@
+import types
+
+from debate_service import llm
+from debate_service.http_client import get_http_client
+from debate_service.services.catalog import LLMConfigInfo
+
+
+def config(other_params=None):
+    return LLMConfigInfo("c", "n", "llama3", "prompt", 0.5, 100, other_params)
+
+
+def test_openai_compatible_models_share_the_http_pool(monkeypatch):
+    calls = []
+    fake = types.SimpleNamespace(init_chat_model=lambda model, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(llm, "_module", lambda name: fake)
+
+    llm.init_chat_model(config())
+    llm.init_chat_model(config('{"provider": "ollama"}'))
+
+    assert calls[0]["http_async_client"] is get_http_client()
+    assert "http_async_client" not in calls[1]
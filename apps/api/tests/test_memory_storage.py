@@ -0,0 +1,54 @@
+def test_rollback_in_one_thread_is_not_committed_by_another(memory_mode):
+    out = memory_mode("""
+        import threading
+        from sqlalchemy import text
+        from debate_service.db import SessionLocal, init_memory_database
+
+        init_memory_database()
+        a_updated = threading.Event()
+        a_done = threading.Event()
+
+        def thread_a():
+            with SessionLocal() as session:
+                session.execute(text("UPDATE scoring_criteria SET max_score = 99"))
+                a_updated.set()
+                # Give thread B the chance to commit while A's change is pending
+                a_done.wait(0.3)
+                session.rollback()
+
+        def thread_b():
+            a_updated.wait()
+            with SessionLocal() as session:
+                session.execute(text("UPDATE llm_configs SET max_tokens = 7"))
+                session.commit()
+
+        threads = [threading.Thread(target=thread_a), threading.Thread(target=thread_b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with SessionLocal() as session:
+            print(session.execute(text("SELECT max(max_score) FROM scoring_criteria")).scalar(),
+                  session.execute(text("SELECT min(max_tokens) FROM llm_configs")).scalar())
+    """)
+    assert out == "10 7"
+
+
+def test_write_coordinator_runs_on_the_memory_engine(memory_mode):
+    out = memory_mode("""
+        from sqlalchemy import text
+        from debate_service import db, db_writer
+
+        db.init_memory_database()
+        db_writer.start_coordinator(db.engine)
+        try:
+            db_writer.write(lambda s: s.execute(text("UPDATE llm_configs SET max_tokens = 5")))
+            try:
+                db_writer.write(lambda s: s.execute(text("UPDATE nope SET x = 1")))
+            except Exception:
+                pass
+            print(db_writer.write(lambda s: s.execute(text("SELECT min(max_tokens) FROM llm_configs")).scalar()))
+        finally:
+            db_writer.stop_coordinator()
+    """)
+    assert out == "5"
@@ -0,0 +1,138 @@
+import textwrap
+
+SETUP = textwrap.dedent("""
+    import asyncio
+    from debate_service import db, llm
+    from debate_service.db import SessionLocal
+    from debate_service.models.schema import Debate, DebateParticipant, User
+    from debate_service.services import lifecycle, orchestrator
+    from debate_service.services.background import INTERVENTION, post_comment
+    from debate_service.services.catalog import get_catalog
+
+    db.init_memory_database()
+    catalog = get_catalog()
+    config_id = next(iter(catalog.llm_configs))
+
+    def add_debate(format_name):
+        with SessionLocal() as session:
+            users = [User(username=name, llm_config_id=config_id) for name in ("mod", "aff", "neg")]
+            session.add_all(users)
+            session.flush()
+            debate = Debate(title="t", proposition="P", format_id=catalog.format_by_name(format_name).format_id,
+                            status=lifecycle.PENDING, moderator_id=users[0].user_id)
+            session.add(debate)
+            session.flush()
+            session.add_all([
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[1].user_id, side="affirmative"),
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[2].user_id, side="negative"),
+            ])
+            session.commit()
+            return debate.debate_id
+
+    prompts_seen = []
+
+    class Reply:
+        usage_metadata = {}
+
+        def __init__(self, content):
+            self.content = content
+""")
+
+
+def test_intervention_reaches_the_replanned_turn(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        debate_id = add_debate("Oxford Style")
+
+        class Model:
+            async def ainvoke(self, messages):
+                prompts_seen.append(messages[1][1])
+                if len(prompts_seen) == 1:
+                    # The second speaker is being prepared while the first one speaks
+                    await asyncio.sleep(0.05)
+                    await post_comment(debate_id, None, "Stay on the proposition.", INTERVENTION)
+                return Reply("speech")
+
+        llm.init_chat_model = lambda config: Model()
+        taken = asyncio.run(orchestrator.DebateOrchestrator(debate_id, catalog).run(max_turns=2))
+        print(taken, ["Stay on the proposition." in prompt for prompt in prompts_seen])
+    """))
+    assert out == "2 [False, True]"
+
+
+def test_intervention_while_awaiting_the_prepared_turn_is_kept(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        debate_id = add_debate("Oxford Style")
+        prepare = orchestrator.DebateOrchestrator.prepare
+        prepared = []
+
+        async def slow_prepare(self, *args):
+            inputs = await prepare(self, *args)
+            prepared.append(inputs)
+            if len(prepared) == 2:
+                # The first speaker commits while the second is still being prepared
+                await asyncio.sleep(0.2)
+            return inputs
+
+        class Model:
+            async def ainvoke(self, messages):
+                prompts_seen.append(messages[1][1])
+                return Reply("speech")
+
+        async def scenario():
+            running = asyncio.create_task(orchestrator.DebateOrchestrator(debate_id, catalog).run(max_turns=2))
+            await asyncio.sleep(0.1)
+            await post_comment(debate_id, None, "Stay on the proposition.", INTERVENTION)
+            return await running
+
+        orchestrator.DebateOrchestrator.prepare = slow_prepare
+        llm.init_chat_model = lambda config: Model()
+        taken = asyncio.run(scenario())
+        print(taken, ["Stay on the proposition." in prompt for prompt in prompts_seen])
+    """))
+    assert out == "2 [False, True]"
+
+
+def test_open_ended_run_stops_at_the_turn_cap(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        debate_id = add_debate("Open-Ended")
+        orchestrator.MAX_OPEN_TURNS = 3
+
+        class Model:
+            async def ainvoke(self, messages):
+                return Reply("speech")
+
+        llm.init_chat_model = lambda config: Model()
+        first = asyncio.run(orchestrator.DebateOrchestrator(debate_id, catalog).run())
+        # A relaunch counts the turns already taken
+        again = asyncio.run(orchestrator.DebateOrchestrator(debate_id, catalog).run())
+        print(first, again)
+    """))
+    assert out == "3 0"
+
+
+def test_completing_a_debate_cancels_its_deadlines(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        from debate_service import scheduler
+
+        debate_id = add_debate("Oxford Style")
+        with SessionLocal() as session:
+            session.get(Debate, debate_id).time_limit_minutes = 60
+            session.commit()
+
+        class Model:
+            async def ainvoke(self, messages):
+                return Reply("speech")
+
+        async def scenario():
+            deadlines = await scheduler.start_scheduler()
+            await orchestrator.DebateOrchestrator(debate_id, catalog).run()
+            left = len(deadlines)
+            await scheduler.stop_scheduler()
+            return left
+
+        llm.init_chat_model = lambda config: Model()
+        left = asyncio.run(scenario())
+        with SessionLocal() as session:
+            print(session.get(Debate, debate_id).status, left)
+    """))
+    assert out == "completed 0"
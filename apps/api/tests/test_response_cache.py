@@ -0,0 +1,89 @@
+from fastapi import Request
+
+from debate_service.response_cache import ResponseCache, etag_matches
+
+
+def request_with(if_none_match):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_etag_matching():
+    assert etag_matches(request_with('"a"'), '"a"')
+    assert etag_matches(request_with('W/"b", "a"'), '"a"')
+    assert etag_matches(request_with("*"), '"a"')
+    assert not etag_matches(request_with('"b"'), '"a"')
+    assert not etag_matches(request_with(None), '"a"')
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (b"1", None, b"3")
+
+
+def test_transcript_revalidates_until_settled_then_is_immutable(memory_mode):
+    out = memory_mode("""
+        import datetime
+        from fastapi.testclient import TestClient
+        from main import app
+        from debate_service.db import SessionLocal
+        from debate_service.models.schema import Debate, DebateParticipant, DebateTurn, User
+        from debate_service.services import lifecycle
+        from debate_service.services.catalog import get_catalog
+        from debate_service.services.writes import COMMENTARY, add_comment
+
+        with TestClient(app) as client:
+            with SessionLocal() as session:
+                user = User(username="u")
+                session.add(user)
+                session.flush()
+                debate = Debate(title="t", proposition="P", status=lifecycle.COMPLETED,
+                                format_id=get_catalog().format_by_name("Oxford Style").format_id,
+                                moderator_id=user.user_id, completed_at=datetime.datetime.utcnow())
+                session.add(debate)
+                session.flush()
+                participant = DebateParticipant(debate_id=debate.debate_id, user_id=user.user_id, side="affirmative")
+                session.add(participant)
+                session.flush()
+                turn = DebateTurn(debate_id=debate.debate_id, participant_id=participant.participant_id,
+                                  content="x", turn_number=1, phase="opening_pro")
+                session.add(turn)
+                debate.next_turn_number = 2
+                session.commit()
+                debate_id, turn_id = debate.debate_id, turn.turn_id
+
+            def get(path, etag=None):
+                response = client.get(f"/debates/{debate_id}/{path}", headers={"If-None-Match": etag} if etag else {})
+                print(response.status_code, response.headers["Cache-Control"])
+                return response.headers["ETag"]
+
+            first = get("transcript")
+            get("transcript", first)
+            with SessionLocal() as session:
+                add_comment(debate_id, turn_id, "late", COMMENTARY, session)
+                session.commit()
+            commented = get("transcript", first)
+            get("verdict")
+            with SessionLocal() as session:
+                lifecycle.settle_debate(session, debate_id)
+                session.commit()
+            settled = get("transcript", commented)
+            get("transcript", settled)
+            get("verdict")
+            print(client.get("/debates/missing/transcript").status_code)
+    """)
+    assert out.splitlines() == [
+        "200 no-cache",
+        "304 no-cache",
+        # A comment landing after completion changes the ETag
+        "200 no-cache",
+        "200 no-cache",
+        "200 public, max-age=31536000, immutable",
+        "304 public, max-age=31536000, immutable",
+        "200 public, max-age=31536000, immutable",
+        "404",
+    ]
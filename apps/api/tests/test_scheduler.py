@@ -0,0 +1,145 @@
+import textwrap
+
+SETUP = textwrap.dedent("""
+    import asyncio
+    import datetime
+    from debate_service import db, scheduler, tasks
+    from debate_service.db import SessionLocal
+    from debate_service.models.schema import Debate, User
+    from debate_service.services import background, lifecycle
+    from debate_service.services.catalog import get_catalog
+
+    db.init_memory_database()
+    debate_format = get_catalog().format_by_name("Oxford Style")
+
+    def add_debate(**values):
+        with SessionLocal() as session:
+            moderator = User(username=f"mod-{len(values)}-{id(values)}")
+            session.add(moderator)
+            session.flush()
+            debate = Debate(title="t", proposition="P", format_id=debate_format.format_id,
+                            moderator_id=moderator.user_id, **values)
+            session.add(debate)
+            session.commit()
+            return debate.debate_id
+
+    def settled(debate_id):
+        with SessionLocal() as session:
+            return session.get(Debate, debate_id).settled_at is not None
+""")
+
+
+def test_startup_settles_debates_completed_before_a_restart(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        long_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+        stale = add_debate(status=lifecycle.COMPLETED, completed_at=long_ago)
+        recent = add_debate(status=lifecycle.COMPLETED, completed_at=datetime.datetime.utcnow())
+
+        async def scenario():
+            await tasks.start_runner()
+            await scheduler.start_scheduler()
+            await asyncio.sleep(0.2)
+            await scheduler.stop_scheduler()
+            await tasks.stop_runner()
+
+        asyncio.run(scenario())
+        print(settled(stale), settled(recent))
+    """))
+    # The recent one is left for the worker that may still be judging it
+    assert out == "True False"
+
+
+def test_settle_waits_while_another_worker_holds_tasks(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        long_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+        debate_id = add_debate(status=lifecycle.COMPLETED, completed_at=long_ago)
+
+        async def scenario():
+            sibling = tasks.TaskRunner(workers=0, durable=True)
+            await sibling.start()
+            await sibling.submit("judge_debate", debate_id=debate_id)
+            await tasks.start_runner(durable=True)
+            await scheduler.start_scheduler()
+            await asyncio.sleep(0.2)
+            await scheduler.stop_scheduler()
+            await tasks.stop_runner()
+
+        asyncio.run(scenario())
+        print(settled(debate_id))
+    """))
+    assert out == "False"
+
+
+def test_debate_deadline_completes_the_debate(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        two_hours_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=2)
+        debate_id = add_debate(status=lifecycle.ACTIVE, started_at=two_hours_ago, time_limit_minutes=60,
+                               current_phase=debate_format.phases[0].name, phase_started_at=two_hours_ago)
+
+        async def scenario():
+            await tasks.start_runner()
+            deadlines = await scheduler.start_scheduler()
+            await asyncio.sleep(0.2)
+            tracked = len(deadlines)
+            await scheduler.stop_scheduler()
+            await tasks.stop_runner()
+            return tracked
+
+        tracked = asyncio.run(scenario())
+        with SessionLocal() as session:
+            print(session.get(Debate, debate_id).status, tracked)
+    """))
+    assert out == "completed 0"
+
+
+def test_phase_deadline_opens_the_next_phase(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        from debate_service.models.schema import DebateFormatPhase
+        from debate_service.services.catalog import invalidate_catalog
+
+        first, second = debate_format.phases[:2]
+        with SessionLocal() as session:
+            session.get(DebateFormatPhase, first.phase_id).time_limit_minutes = 1
+            session.commit()
+        invalidate_catalog()
+
+        five_minutes_ago = datetime.datetime.utcnow() - datetime.timedelta(minutes=5)
+        debate_id = add_debate(status=lifecycle.ACTIVE, started_at=five_minutes_ago,
+                               current_phase=first.name, phase_started_at=five_minutes_ago)
+
+        async def scenario():
+            await scheduler.start_scheduler()
+            await asyncio.sleep(0.2)
+            await scheduler.stop_scheduler()
+
+        asyncio.run(scenario())
+        with SessionLocal() as session:
+            debate = session.get(Debate, debate_id)
+            print(debate.status, debate.current_phase == second.name, debate.phase_started_at > five_minutes_ago)
+    """))
+    assert out == "active True True"
+
+
+def test_stale_phase_deadline_changes_nothing(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        phase = debate_format.phases[0].name
+        long_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+        restarted = datetime.datetime.utcnow()
+        debate_id = add_debate(status=lifecycle.ACTIVE, started_at=long_ago,
+                               current_phase=phase, phase_started_at=restarted)
+
+        async def scenario():
+            deadlines = scheduler.DeadlineScheduler()
+            # Due long ago, but for an earlier opening of the same phase
+            deadlines.register(debate_id, scheduler.PHASE, long_ago, debate_format.format_id, phase, long_ago)
+            deadlines.start()
+            await asyncio.sleep(0.1)
+            await deadlines.stop()
+            return len(deadlines)
+
+        tracked = asyncio.run(scenario())
+        with SessionLocal() as session:
+            debate = session.get(Debate, debate_id)
+            print(debate.status, debate.current_phase == phase, debate.phase_started_at == restarted, tracked)
+    """))
+    assert out == "active True True 0"
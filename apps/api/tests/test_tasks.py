@@ -0,0 +1,161 @@
+import asyncio
+
+from debate_service import tasks
+
+
+def test_stop_waits_for_tasks_backing_off():
+    calls = []
+
+    @tasks.task("test_flaky")
+    async def flaky(n: int):
+        calls.append(n)
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+
+    async def scenario():
+        runner = tasks.TaskRunner(workers=1, durable=False, retry_base_delay=0.05)
+        await runner.start()
+        await runner.submit("test_flaky", n=1)
+        await runner.stop(timeout=5)
+
+    asyncio.run(scenario())
+    assert calls == [1, 1, 1]
+
+
+def test_retry_scheduled_even_if_status_write_fails():
+    calls = []
+
+    @tasks.task("test_flaky_durable")
+    async def flaky(n: int):
+        calls.append(n)
+        if len(calls) < 2:
+            raise RuntimeError("transient")
+
+    class BrokenMarks(tasks.TaskRunner):
+        async def _persist(self, item):
+            pass
+
+        async def _mark(self, item, status, error):
+            raise OSError("disk full")
+
+        async def _forget(self, item):
+            pass
+
+    async def scenario():
+        runner = BrokenMarks(workers=1, durable=True, retry_base_delay=0.05)
+        runner._workers = [asyncio.create_task(runner._work())]
+        await runner.submit("test_flaky_durable", n=1)
+        await runner.stop(timeout=5)
+
+    asyncio.run(scenario())
+    assert calls == [1, 1]
+
+
+def test_after_drain_waits_for_every_task_of_the_debate():
+    order = []
+
+    @tasks.task("test_slow_comment")
+    async def slow_comment(debate_id: str):
+        await asyncio.sleep(0.05)
+        order.append(("comment", debate_id))
+
+    @tasks.task("test_settle")
+    async def settle(debate_id: str):
+        order.append(("settle", debate_id))
+
+    async def scenario():
+        runner = tasks.TaskRunner(workers=4, durable=False)
+        await runner.start()
+        await runner.submit("test_slow_comment", debate_id="d1")
+        await runner.submit("test_slow_comment", debate_id="d1")
+        runner.after_drain("d1", "test_settle")
+        runner.after_drain("d2", "test_settle")
+        await runner.stop(timeout=5)
+        return runner.pending("d1")
+
+    assert asyncio.run(scenario()) == 0
+    assert order == [("settle", "d2"), ("comment", "d1"), ("comment", "d1"), ("settle", "d1")]
+
+
+def test_stored_tasks_are_taken_over_only_once_their_claim_expires(memory_mode):
+    out = memory_mode("""
+        import asyncio
+        from debate_service import db, tasks
+
+        db.init_memory_database()
+        ran = []
+
+        @tasks.task("test_note")
+        async def note(n: int):
+            ran.append(n)
+
+        async def scenario():
+            # A sibling that queued a task but has not run it yet
+            busy = tasks.TaskRunner(workers=0, durable=True, lease_seconds=0.3)
+            await busy.start()
+            await busy.submit("test_note", n=1)
+            runner = tasks.TaskRunner(workers=1, durable=True, lease_seconds=0.3)
+            await runner.start()
+            await asyncio.sleep(0.6)
+            while_alive = list(ran)
+            # The sibling dies: its claim is no longer renewed
+            busy._heartbeat.cancel()
+            await asyncio.sleep(0.6)
+            await runner.stop(timeout=2)
+            return while_alive, ran
+
+        print(*asyncio.run(scenario()))
+    """)
+    assert out == "[] [1]"
+
+
+def test_stop_releases_claims_for_the_next_start(memory_mode):
+    out = memory_mode("""
+        import asyncio
+        from debate_service import db, tasks
+
+        db.init_memory_database()
+        ran = []
+
+        @tasks.task("test_note")
+        async def note(n: int):
+            ran.append(n)
+
+        async def scenario():
+            first = tasks.TaskRunner(workers=0, durable=True)
+            await first.start()
+            await first.submit("test_note", n=1)
+            await first.stop(timeout=0.1)
+            second = tasks.TaskRunner(workers=1, durable=True)
+            await second.start()
+            await second.stop(timeout=2)
+            return ran
+
+        print(asyncio.run(scenario()))
+    """)
+    assert out == "[1]"
+
+
+def test_after_drain_waits_for_room_instead_of_dropping():
+    order = []
+
+    @tasks.task("test_fill")
+    async def fill(debate_id: str):
+        await asyncio.sleep(0.05)
+        order.append(("fill", debate_id))
+
+    @tasks.task("test_follow_up")
+    async def follow_up(debate_id: str):
+        order.append(("follow_up", debate_id))
+
+    async def scenario():
+        runner = tasks.TaskRunner(workers=1, queue_size=1, durable=False)
+        await runner.start()
+        await runner.submit("test_fill", debate_id="d1")
+        await runner.submit("test_fill", debate_id="d2")
+        # d1's follow-up is queued while d2's task still fills the queue
+        runner.after_drain("d1", "test_follow_up")
+        await runner.stop(timeout=5)
+
+    asyncio.run(scenario())
+    assert ("follow_up", "d1") in order
@@ -0,0 +1,91 @@
+import pytest
+
+from debate_service.services.catalog import FormatInfo, PhaseInfo
+from debate_service.services.turns import TurnOrderError, validate_turn
+
+OXFORD = FormatInfo("f1", "Oxford Style", "strict", (
+    PhaseInfo("p1", "f1", "opening_pro", 1, "", 1),
+    PhaseInfo("p2", "f1", "opening_con", 2, "", 1),
+    PhaseInfo("p3", "f1", "cross_examination", 3, "", 3),
+))
+OPEN_ENDED = FormatInfo("f2", "Open-Ended", "flexible", (
+    PhaseInfo("p4", "f2", "discussion", 1, "", None),
+))
+
+
+@pytest.mark.parametrize("phase, side, current_phase, phase_turn_count, last_side", [
+    ("rebuttal", "affirmative", "opening_pro", 0, None),
+    ("opening_pro", "judge", "opening_pro", 0, None),
+    ("opening_pro", "affirmative", "opening_pro", 1, "affirmative"),
+    ("opening_con", "negative", "opening_pro", 0, None),
+    ("cross_examination", "affirmative", "opening_pro", 1, "affirmative"),
+    ("opening_pro", "negative", "opening_pro", 0, None),
+    ("cross_examination", "negative", "cross_examination", 1, "negative"),
+    ("cross_examination", "negative", "cross_examination", 3, "affirmative"),
+])
+def test_out_of_order_turns_are_rejected(phase, side, current_phase, phase_turn_count, last_side):
+    with pytest.raises(TurnOrderError):
+        validate_turn(OXFORD, phase, side, current_phase, phase_turn_count, last_side)
+
+
+def test_turns_in_order_count_within_their_phase():
+    assert validate_turn(OXFORD, "opening_pro", "affirmative", "opening_pro", 0, None) == 1
+    assert validate_turn(OXFORD, "opening_con", "negative", "opening_pro", 1, "affirmative") == 1
+    assert validate_turn(OXFORD, "cross_examination", "affirmative", "cross_examination", 1, "negative") == 2
+    assert validate_turn(OPEN_ENDED, "discussion", "negative", "discussion", 7, "negative") == 8
+
+
+def test_concurrent_appends_get_distinct_consecutive_numbers(file_mode):
+    out = file_mode("""
+        import threading
+        from debate_service import db
+        from debate_service.db import SessionLocal
+        from debate_service.models.schema import Debate, DebateParticipant, DebateTurn, User
+        from debate_service.services import lifecycle
+        from debate_service.services.catalog import get_catalog
+        from debate_service.services.turns import append_turn
+
+        db.init_memory_database()
+        debate_format = get_catalog().format_by_name("Open-Ended")
+        with SessionLocal() as session:
+            users = [User(username=name) for name in ("mod", "aff", "neg")]
+            session.add_all(users)
+            session.flush()
+            debate = Debate(title="t", proposition="P", format_id=debate_format.format_id,
+                            status=lifecycle.PENDING, moderator_id=users[0].user_id)
+            session.add(debate)
+            session.flush()
+            participants = [
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[1].user_id, side="affirmative"),
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[2].user_id, side="negative"),
+            ]
+            session.add_all(participants)
+            session.flush()
+            lifecycle.start_debate(session, debate.debate_id, debate_format)
+            session.commit()
+            debate_id = debate.debate_id
+            participant_ids = [p.participant_id for p in participants]
+
+        errors = []
+
+        def speak(n):
+            try:
+                for _ in range(30):
+                    with SessionLocal() as session:
+                        append_turn(session, debate_id, participant_ids[n % 2], "discussion", "speech")
+                        session.commit()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=speak, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with SessionLocal() as session:
+            numbers = [n for (n,) in session.query(DebateTurn.turn_number).filter(DebateTurn.debate_id == debate_id)]
+            debate = session.get(Debate, debate_id)
+            print(errors, sorted(numbers) == list(range(1, 241)), debate.next_turn_number, debate.phase_turn_count)
+    """)
+    assert out == "[] True 241 240"
@@ -0,0 +1,90 @@
+import textwrap
+
+SETUP = textwrap.dedent("""
+    import datetime
+    from sqlalchemy import func, select
+    from debate_service import db
+    from debate_service.db import SessionLocal
+    from debate_service.models.schema import Debate, DebateParticipant, DebateTurn, User
+    from debate_service.services import lifecycle, usage
+    from debate_service.services.catalog import get_catalog
+    from debate_service.services.turns import append_turn
+
+    db.init_memory_database()
+    catalog = get_catalog()
+    config_id = next(iter(catalog.llm_configs))
+    model = catalog.llm_configs[config_id].model
+    debate_format = catalog.format_by_name("Open-Ended")
+
+    def add_debate():
+        with SessionLocal() as session:
+            users = [User(username=f"{name}-{id(session)}", llm_config_id=config)
+                     for name, config in (("mod", None), ("aff", config_id), ("neg", None))]
+            session.add_all(users)
+            session.flush()
+            debate = Debate(title="t", proposition="P", format_id=debate_format.format_id,
+                            status=lifecycle.PENDING, moderator_id=users[0].user_id)
+            session.add(debate)
+            session.flush()
+            participants = [
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[1].user_id, side="affirmative"),
+                DebateParticipant(debate_id=debate.debate_id, user_id=users[2].user_id, side="negative"),
+            ]
+            session.add_all(participants)
+            session.flush()
+            lifecycle.start_debate(session, debate.debate_id, debate_format)
+            session.commit()
+            return debate.debate_id, [p.participant_id for p in participants]
+""")
+
+
+def test_rollups_match_the_turns_they_count(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        debates = [add_debate(), add_debate()]
+        for n in range(9):
+            debate_id, (llm, human) = debates[n % 2]
+            with SessionLocal() as session:
+                append_turn(session, debate_id, llm if n % 3 else human, "discussion", "speech",
+                            tokens_used=None if n == 4 else 100 + n)
+                session.commit()
+
+        with SessionLocal() as session:
+            usage.set_price(session, model, 0.5)
+            session.commit()
+            for debate_id, (llm, _) in debates:
+                turns, tokens = session.execute(
+                    select(func.count(), func.coalesce(func.sum(DebateTurn.tokens_used), 0))
+                    .where(DebateTurn.debate_id == debate_id, DebateTurn.participant_id == llm)
+                ).one()
+                [row] = usage.usage_for_debate(session, catalog, debate_id)
+                print(row["turns"] == turns, row["tokens_used"] == tokens, row["cost_usd"] == tokens / 1000 * 0.5)
+            [day] = usage.usage_by_day(session, catalog, llm_config_id=config_id)
+            [by_model] = usage.usage_by_model(session, catalog)
+            print(day["turns"], day["tokens_used"], by_model["model"] == model, by_model["tokens_used"])
+    """))
+    # Turns 0, 3 and 6 are the human's; turn 4 reports no tokens
+    assert out.splitlines() == ["True True True", "True True True", "6 523 True 523"]
+
+
+def test_bulk_usage_adds_to_existing_rollups(memory_mode):
+    out = memory_mode(SETUP + textwrap.dedent("""
+        debate_id, (llm, human) = add_debate()
+        with SessionLocal() as session:
+            append_turn(session, debate_id, llm, "discussion", "speech", tokens_used=10)
+            session.commit()
+
+        yesterday = datetime.datetime.utcnow() - datetime.timedelta(days=1)
+        imported = [
+            {"debate_id": debate_id, "participant_id": llm, "timestamp": yesterday, "tokens_used": 20},
+            {"debate_id": debate_id, "participant_id": llm, "timestamp": yesterday, "tokens_used": None},
+            {"debate_id": debate_id, "participant_id": human, "timestamp": yesterday, "tokens_used": 40},
+        ]
+        with db.engine.begin() as connection:
+            usage.record_bulk_usage(connection, imported, {llm: config_id})
+
+        with SessionLocal() as session:
+            [row] = usage.usage_for_debate(session, catalog, debate_id)
+            days = usage.usage_by_day(session, catalog, llm_config_id=config_id)
+            print(row["turns"], row["tokens_used"], [(d["day"] == yesterday.date(), d["turns"], d["tokens_used"]) for d in days])
+    """))
+    assert out == "3 30 [(True, 2, 20), (False, 1, 10)]"